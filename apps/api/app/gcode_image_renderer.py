@@ -1,9 +1,9 @@
 """Render multi-angle preview images of a G-code file.
 
-Streams through G-code line-by-line collecting extrusion segments with 3D
-coordinates, then projects them from multiple viewpoints onto a composite
-image.  Memory usage is O(segments) which is much less than O(gcode_lines)
-since travel moves, comments, and control lines are discarded.
+Scans the G-code with batched regex passes and resolves the positioning
+state with NumPy to collect extrusion segments with 3D coordinates, then
+projects them from multiple viewpoints onto a composite image.  Segments are
+kept as compact float32 arrays; comments and control lines are discarded.
 
 Layout: one large 3D perspective view with two smaller orthographic insets
 (top-down and front/side).
@@ -12,18 +12,45 @@ Supports multi-tool coloring (T0, T1, ...) using the filament_colors list.
 """
 
 import re
+import os
 import math
+import mmap
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 logger = logging.getLogger(__name__)
 
 # Regex patterns
-COORD_RE = re.compile(r'([XYZEF])([-+]?\d*\.?\d+)')
-ARC_OFFSET_RE = re.compile(r'([IJ])([-+]?\d*\.?\d+)')
+# Possessive quantifiers (Python 3.11+) keep every pattern backtracking-free:
+# each byte is examined once, which matters on multi-million-line files.
+
+# Commands that affect segment collection, matched at the start of a line.
+# Captures the command word and its parameters up to any comment.
+COMMAND_RE = re.compile(
+    rb'(?m)^[ \t]*+((?:G9[0-2]|G[0-3](?=[ \t\r;]|$)|M8[23]|T\d)[^\n;]*+)'
+)
+
+# Signed decimal such as "12", "-0.5", ".25" or "+3."
+_NUMBER = rb'([-+]?+(?:\d++(?:\.\d*+)?+|\.\d++))'
+
+# One pattern per axis, run over the newline-joined command lines of all
+# matched commands.  Every line yields exactly one match (an empty capture
+# when the axis is absent), so results stay aligned with the command list.
+AXIS_RES = {
+    axis: re.compile(rb'\n[^\n' + axis + rb']*+(?:' + axis + _NUMBER + rb')?')
+    for axis in (b'X', b'Y', b'Z', b'E')
+}
+
+TRAVEL_DECIMATE = 10  # Keep 1 in N travel moves
+MAX_TOOL_ID = 255  # Tool numbers are stored as uint8
+MAX_SEGMENTS = 2_000_000  # Extrusion segments kept in memory for rendering
+PARSE_CHUNK_BYTES = 32 << 20  # G-code bytes tokenized per parse step
 
 # Default colors (vibrant, distinct — used when filament_colors not provided)
 DEFAULT_TOOL_COLORS = [
@@ -37,6 +64,9 @@ DEFAULT_TOOL_COLORS = [
     (249, 115, 22),   # Orange
 ]
 
+TRAVEL_COLOR = (60, 40, 40)  # Dim red-brown for travel moves
+PLATE_COLOR = (70, 70, 70)   # Plate outline color
+
 BED_SIZE = 270  # Snapmaker U1 bed size in mm
 
 
@@ -76,107 +106,304 @@ def _build_tool_colors(
 # G-code parsing — collect 3D extrusion segments
 # ---------------------------------------------------------------------------
 
-def _parse_segments(gcode_path: Path):
+@dataclass
+class Segments:
+    """Struct-of-arrays store for line segments (float32 coords, uint8 tool)."""
+    x1: np.ndarray
+    y1: np.ndarray
+    z1: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+    z2: np.ndarray
+    tool: np.ndarray
+
+    @classmethod
+    def from_columns(cls, x1, y1, z1, x2, y2, z2, tool) -> "Segments":
+        coords = (np.ascontiguousarray(c, dtype=np.float32) for c in (x1, y1, z1, x2, y2, z2))
+        return cls(*coords, np.ascontiguousarray(tool, dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.x1)
+
+    def take(self, index) -> "Segments":
+        """Select segments by slice, boolean mask, or index array."""
+        return Segments(*(getattr(self, f.name)[index] for f in fields(self)))
+
+    @classmethod
+    def concat(cls, parts: List["Segments"]) -> "Segments":
+        """Join segment stores end to end."""
+        if not parts:
+            empty = np.empty(0)
+            return cls.from_columns(*(empty,) * len(fields(cls)))
+        if len(parts) == 1:
+            return parts[0]
+        return cls(*(np.concatenate([getattr(p, f.name) for p in parts]) for f in fields(cls)))
+
+
+# Command codes assigned during tokenization
+CMD_MOVE, CMD_G90, CMD_G91, CMD_G92, CMD_M82, CMD_M83, CMD_TOOL = range(1, 8)
+
+_CMD_BY_PREFIX = {
+    b'G90': CMD_G90, b'G91': CMD_G91, b'G92': CMD_G92,
+    b'M82': CMD_M82, b'M83': CMD_M83,
+}
+
+
+@dataclass
+class ParserState:
+    """Positioning state carried between G-code commands."""
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+    e: float = 0.0
+    relative_pos: bool = False
+    relative_ext: bool = True
+    tool: int = 0
+
+
+def _forward_fill(mask: np.ndarray, values: np.ndarray, initial) -> np.ndarray:
+    """Carry ``values`` forward from each index where ``mask`` is set."""
+    idx = np.where(mask, np.arange(len(mask)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(idx >= 0, values[idx], initial)
+
+
+def _axis_positions(
+    values: np.ndarray,
+    is_move: np.ndarray,
+    is_reset: np.ndarray,
+    relative: np.ndarray,
+    start: float,
+) -> np.ndarray:
+    """Resolve one axis to its position after every command.
+
+    Absolute moves and G92 resets pin the position (anchors); relative moves
+    add onto it.  The position after command ``i`` is the last anchor value
+    (or ``start``) plus the cumulative relative deltas since that anchor.
+    """
+    has = ~np.isnan(values)
+    rel_moves = has & is_move & relative
+    if not rel_moves.any():
+        # Absolute-only axis (G90 XYZ, M82 E): each value simply holds until
+        # the next one, so skip the cumulative-sum bookkeeping.
+        return _forward_fill(has & (is_move | is_reset), values, start)
+    anchor = has & (is_reset | (is_move & ~relative))
+    if not anchor.any():
+        # Relative-only axis with no G92 (e.g. M83 E): a running sum
+        return start + np.cumsum(np.where(rel_moves, values, 0.0))
+    csum = np.cumsum(np.where(rel_moves, values, 0.0))
+    idx = np.where(anchor, np.arange(len(values)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    base = np.where(idx >= 0, values[idx] - csum[idx], start)
+    return base + csum
+
+
+def _tokenize(data):
+    """Extract command codes, axis values, and tool numbers from G-code.
+
+    ``data`` is any bytes-like buffer (``bytes`` or an ``mmap``).
+
+    Returns:
+        (codes, values, tool_ids): int8 command codes, a (4, N) float64
+        array of X/Y/Z/E parameters (NaN where absent), and the tool number
+        of each tool-change command (0 elsewhere).  Tool changes that are
+        malformed or above ``MAX_TOOL_ID`` are dropped (code 0).
+    """
+    lines = COMMAND_RE.findall(data)
+    n = len(lines)
+    if not n:
+        return np.zeros(0, dtype=np.int8), np.zeros((4, 0)), np.zeros(0, dtype=np.int64)
+
+    # Classify each command by its leading bytes (truncating string dtypes)
+    prefixes = np.array(lines, dtype='S3')
+    codes = np.zeros(n, dtype=np.int8)
+    codes[np.isin(prefixes.astype('S2'), (b'G0', b'G1', b'G2', b'G3'))] = CMD_MOVE
+    for prefix, code in _CMD_BY_PREFIX.items():
+        codes[prefixes == prefix] = code
+    is_tool = prefixes.astype('S1') == b'T'
+    codes[is_tool] = CMD_TOOL
+
+    tool_ids = np.zeros(n, dtype=np.int64)
+    for i in np.flatnonzero(is_tool):
+        try:
+            tool = int(lines[i][1:].split()[0])
+        except (ValueError, IndexError):
+            tool = -1
+        if 0 <= tool <= MAX_TOOL_ID:
+            tool_ids[i] = tool
+        else:
+            # Malformed ("T1a") or out-of-range tool change: keep the previous tool
+            codes[i] = 0
+
+    joined = b'\n' + b'\n'.join(lines)
+    # Decode straight into the float64 rows.  float() parses bytes directly
+    # and measures faster than NumPy's bytes->float cast, which goes through
+    # Python float objects anyway; fromiter skips the intermediate list.
+    values = np.empty((4, n))
+    for row, axis_re in enumerate(AXIS_RES.values()):
+        values[row] = np.fromiter(
+            (float(v) if v else np.nan for v in axis_re.findall(joined)),
+            dtype=np.float64, count=n,
+        )
+
+    return codes, values, tool_ids
+
+
+def _accumulate_state(
+    codes: np.ndarray,
+    values: np.ndarray,
+    tool_ids: np.ndarray,
+    state: ParserState,
+):
+    """Run the positioning state machine over tokenized commands.
+
+    Returns:
+        (columns, moved, extruding, state) where ``columns`` holds the
+        (x1, y1, z1, x2, y2, z2, tool) arrays of every move, ``moved`` and
+        ``extruding`` are per-move masks, and ``state`` is the state after
+        the last command.
+    """
+    is_move = codes == CMD_MOVE
+    is_reset = codes == CMD_G92
+    is_tool = codes == CMD_TOOL
+    rel_pos = _forward_fill(
+        (codes == CMD_G90) | (codes == CMD_G91), codes == CMD_G91, state.relative_pos
+    )
+    rel_ext = _forward_fill(
+        (codes == CMD_M82) | (codes == CMD_M83), codes == CMD_M83, state.relative_ext
+    )
+    tools = _forward_fill(is_tool, tool_ids, state.tool)
+
+    starts = (state.x, state.y, state.z, state.e)
+    moves = np.flatnonzero(is_move)
+    prev = moves - 1
+    first = prev < 0
+    prev[first] = 0
+
+    ends = []
+    for row, start in enumerate(starts):
+        relative = rel_ext if row == 3 else rel_pos
+        pos = _axis_positions(values[row], is_move, is_reset, relative, start)
+        # Position before each move is the position after the previous command
+        before = pos[prev]
+        before[first] = start
+        ends.append((before, pos[moves], pos[-1] if len(pos) else start))
+
+    (x1, x2, x), (y1, y2, y), (z1, z2, z), (e1, e2, e) = ends
+    # Skip moves with no XY displacement
+    moved = (np.abs(x2 - x1) >= 0.001) | (np.abs(y2 - y1) >= 0.001)
+    extruding = e2 > e1
+
+    new_state = ParserState(
+        float(x), float(y), float(z), float(e),
+        bool(rel_pos[-1]) if len(codes) else state.relative_pos,
+        bool(rel_ext[-1]) if len(codes) else state.relative_ext,
+        int(tools[-1]) if len(codes) else state.tool,
+    )
+    columns = (x1, y1, z1, x2, y2, z2, tools[moves])
+    return columns, moved, extruding, new_state
+
+
+def _iter_chunks(gcode_path: Path):
+    """Yield the file's bytes in roughly PARSE_CHUNK_BYTES pieces.
+
+    Pieces always end on a line boundary so no command is split.
+    """
+    # Map the file and slice it in place: no UTF-8 decode and no per-line
+    # string objects, and only one chunk is resident at a time.
+    with open(gcode_path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return  # Empty files can't be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            start = 0
+            while start < size:
+                end = min(start + PARSE_CHUNK_BYTES, size)
+                if end < size:
+                    newline = mm.find(b'\n', end)
+                    end = size if newline < 0 else newline + 1
+                yield mm[start:end]
+                start = end
+
+
+class _StreamDecimator:
+    """Keep every ``keep_every``-th segment of a stream, within a cap.
+
+    Segments whose running index ``i`` satisfies
+    ``i % keep_every == phase`` are kept.  Whenever more than ``cap`` are
+    held the kept set is halved and ``keep_every`` doubled, which preserves
+    the same rule, so memory stays bounded by the cap.
+    """
+
+    def __init__(self, cap: int, keep_every: int = 1, phase: int = 0):
+        self.cap = cap
+        self.keep_every = keep_every
+        self.phase = phase
+        self.n_seen = 0
+        self.n_kept = 0
+        self.parts: List[Segments] = []
+
+    def add(self, segs: Segments, idx: np.ndarray) -> None:
+        """Offer the segments at ``idx`` (in stream order) for keeping."""
+        first = (self.phase - self.n_seen) % self.keep_every
+        self.n_seen += len(idx)
+        part = segs.take(idx[first::self.keep_every])
+        self.parts.append(part)
+        self.n_kept += len(part)
+
+        while self.n_kept > self.cap:
+            merged = Segments.concat(self.parts).take(slice(None, None, 2))
+            self.parts = [merged]
+            self.n_kept = len(merged)
+            self.keep_every *= 2
+
+    def result(self) -> Segments:
+        return Segments.concat(self.parts)
+
+
+def _parse_segments(gcode_path: Path, max_segments: int = MAX_SEGMENTS):
     """Parse G-code and return extrusion segments, travel segments, and max Z.
 
+    The file is tokenized chunk by chunk with a handful of regex passes and
+    the positioning state machine (G90/G91, M82/M83, G92, tool changes) is
+    resolved with NumPy array operations instead of per-line Python, with
+    the state carried across chunk boundaries.
+
+    Extrusions and travels are decimated while streaming by
+    ``_StreamDecimator``: extrusions start at every segment and travels at
+    1 in ``TRAVEL_DECIMATE``, and both are halved again whenever more than
+    ``max_segments`` are held.  Peak memory therefore stays bounded by the
+    cap rather than by the file size.
+
     Returns:
-        (extrusions, travels, max_z) where each segment is
-        (x1, y1, z1, x2, y2, z2, tool_idx).
-        Travels are decimated (1-in-N) to keep memory reasonable.
+        (extrusions, travels, max_z) where extrusions and travels are
+        ``Segments`` column stores.  ``max_z`` covers every extrusion,
+        including decimated ones.
     """
-    extrusions = []
-    travels = []
-    x, y, z, e = 0.0, 0.0, 0.0, 0.0
-    absolute_pos = True
-    absolute_ext = False
-    current_tool = 0
+    state = ParserState()
+    extrusions = _StreamDecimator(max_segments)
+    # Keep the 10th, 20th, ... travel, as the per-line parser did
+    travels = _StreamDecimator(max_segments, TRAVEL_DECIMATE, TRAVEL_DECIMATE - 1)
     max_z = 0.0
-    travel_count = 0
-    TRAVEL_DECIMATE = 10  # Keep 1 in N travel moves
-
-    with open(gcode_path, 'r', encoding='utf-8', errors='replace') as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line or line[0] == ';':
-                continue
-            if ';' in line:
-                line = line[:line.index(';')].strip()
-                if not line:
-                    continue
-
-            first = line[0]
-
-            # Tool change
-            if first == 'T' and len(line) >= 2 and line[1].isdigit():
-                try:
-                    current_tool = int(line[1:].split()[0])
-                except (ValueError, IndexError):
-                    pass
-                continue
-
-            # Positioning modes
-            if line.startswith('G90'):
-                absolute_pos = True
-                continue
-            elif line.startswith('G91'):
-                absolute_pos = False
-                continue
-            elif line.startswith('M82'):
-                absolute_ext = True
-                continue
-            elif line.startswith('M83'):
-                absolute_ext = False
-                continue
-
-            # Position reset
-            if line.startswith('G92'):
-                coords = dict(COORD_RE.findall(line))
-                if 'X' in coords: x = float(coords['X'])
-                if 'Y' in coords: y = float(coords['Y'])
-                if 'Z' in coords: z = float(coords['Z'])
-                if 'E' in coords: e = float(coords['E'])
-                continue
-
-            # Movement commands: G0, G1, G2, G3
-            is_move = False
-            if first == 'G' and len(line) >= 2:
-                if line[1] in ('0', '1') and (len(line) == 2 or line[2] in (' ', '\t')):
-                    is_move = True
-                elif line[1] in ('2', '3') and (len(line) == 2 or line[2] in (' ', '\t')):
-                    is_move = True
-
-            if not is_move:
-                continue
-
-            coords = dict(COORD_RE.findall(line))
-            prev_x, prev_y, prev_z, prev_e = x, y, z, e
-
-            if 'X' in coords:
-                x = float(coords['X']) if absolute_pos else x + float(coords['X'])
-            if 'Y' in coords:
-                y = float(coords['Y']) if absolute_pos else y + float(coords['Y'])
-            if 'Z' in coords:
-                z = float(coords['Z']) if absolute_pos else z + float(coords['Z'])
-            if 'E' in coords:
-                new_e = float(coords['E'])
-                e = new_e if absolute_ext else e + new_e
-
-            # Skip moves with no XY displacement
-            if abs(x - prev_x) < 0.001 and abs(y - prev_y) < 0.001:
-                continue
-
-            if e > prev_e:
-                # Extrusion move
-                extrusions.append((prev_x, prev_y, prev_z, x, y, z, current_tool))
-                if z > max_z:
-                    max_z = z
-            else:
-                # Travel move — decimate to keep memory reasonable
-                travel_count += 1
-                if travel_count % TRAVEL_DECIMATE == 0:
-                    travels.append((prev_x, prev_y, prev_z, x, y, z, current_tool))
-
-    return extrusions, travels, max_z
+
+    for chunk in _iter_chunks(gcode_path):
+        columns, moved, extruding, state = _accumulate_state(*_tokenize(chunk), state)
+        segs = Segments.from_columns(*columns)
+        travels.add(segs, np.flatnonzero(moved & ~extruding))
+
+        idx = np.flatnonzero(moved & extruding)
+        if len(idx) == 0:
+            continue
+        max_z = max(max_z, float(segs.z2[idx].max()))
+        extrusions.add(segs, idx)
+
+    if extrusions.keep_every > 1:
+        logger.info(
+            f"Decimated {extrusions.n_seen:,} extrusions to {extrusions.n_kept:,} segments "
+            f"(1/{extrusions.keep_every})"
+        )
+
+    return extrusions.result(), travels.result(), max_z
 
 
 # ---------------------------------------------------------------------------
@@ -184,30 +411,36 @@ def _parse_segments(gcode_path: Path):
 # ---------------------------------------------------------------------------
 
 def _project_iso(
-    gx: float, gy: float, gz: float,
+    gx, gy, gz,
     cx: float, cy: float,
     scale: float, ox: float, oy: float, view_h: float,
-) -> Tuple[float, float]:
+) -> Tuple:
     """Isometric-ish 3D projection (30° elevation, 45° rotation).
 
     Center the bed at (cx, cy, 0), apply rotation, then simple oblique
     projection so height (Z) shifts points up and slightly back.
+    Accepts scalars or NumPy arrays (projects all points in one pass).
+
+    Centering, rotation, scale and origin are constant per view, so they are
+    folded into one affine map up front:
+        px = ax*x + ay*y + a0
+        py = bx*x + by*y + bz*z + b0
+    which costs a few multiply-adds per point instead of the step-by-step
+    transform.
     """
-    # Center on bed
-    rx = gx - cx
-    ry = gy - cy
-
     # Rotate 45° around Z for a nice corner view
     cos45 = 0.7071
     sin45 = 0.7071
-    rx2 = rx * cos45 - ry * sin45
-    ry2 = rx * sin45 + ry * cos45
 
     # Project: X → horizontal, Y+Z → vertical (oblique cabinet-style)
-    # ry2 contributes depth (scaled down), gz contributes height
-    px = ox + rx2 * scale
-    py = oy - (ry2 * scale * 0.5 + gz * scale)
-
+    # rotated Y contributes depth (scaled down), gz contributes height
+    ax, ay = scale * cos45, -scale * sin45
+    a0 = ox - (cx * ax + cy * ay)
+    bx, by, bz = -0.5 * scale * sin45, -0.5 * scale * cos45, -scale
+    b0 = oy - (cx * bx + cy * by)
+
+    px = gx * ax + gy * ay + a0
+    py = gx * bx + gy * by + gz * bz + b0
     return (px, py)
 
 
@@ -215,7 +448,7 @@ def _project_top(
     gx: float, gy: float,
     scale: float, margin: float, panel_size: float,
 ) -> Tuple[float, float]:
-    """Top-down orthographic projection (XY plane)."""
+    """Top-down orthographic projection (XY plane). Scalars or arrays."""
     px = margin + gx * scale
     py = panel_size - margin - gy * scale
     return (px, py)
@@ -225,12 +458,278 @@ def _project_front(
     gx: float, gz: float,
     scale: float, margin: float, panel_w: float, panel_h: float,
 ) -> Tuple[float, float]:
-    """Front view orthographic projection (XZ plane)."""
+    """Front view orthographic projection (XZ plane). Scalars or arrays."""
     px = margin + gx * scale
     py = panel_h - margin - gz * scale
     return (px, py)
 
 
+# ---------------------------------------------------------------------------
+# Rasterization
+# ---------------------------------------------------------------------------
+
+RASTER_BATCH_PIXELS = 1 << 20  # Max line pixels generated per NumPy batch
+
+# Line stepping uses int32 fixed point with FIXED_SHIFT fractional bits.
+# Clamping pixel coordinates to +/-PIXEL_LIMIT keeps every intermediate
+# value (start << shift plus step * t) inside int32.
+FIXED_SHIFT = 15
+PIXEL_LIMIT = (1 << 14) - 1
+
+
+def _to_pixels(*coords: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Round projected coordinates to int16 pixel positions.
+
+    Preview images are at most a few thousand pixels across, so int16 holds
+    every on-canvas position; far off-canvas points are clamped to
+    +/-PIXEL_LIMIT, which only affects lines that are clipped away anyway.
+    """
+    return tuple(
+        np.clip(np.rint(c), -PIXEL_LIMIT, PIXEL_LIMIT).astype(np.int16) for c in coords
+    )
+
+
+def _color_lookup(tools: np.ndarray, n_colors: int) -> np.ndarray:
+    """Map tool numbers to 1-based palette indices (0 is reserved for "unpainted").
+
+    Built once per render and shared by every panel, so the modulo and
+    dtype conversion are not repeated per view.
+    """
+    index_dtype = np.uint8 if n_colors < 255 else np.uint16
+    return (tools % n_colors).astype(index_dtype) + 1
+
+
+def _last_occurrences(
+    x1: np.ndarray, y1: np.ndarray,
+    x2: np.ndarray, y2: np.ndarray,
+) -> np.ndarray:
+    """Ascending indices of the last segment for each distinct pixel line.
+
+    Endpoints are int16 pixels, so the four of them pack losslessly into
+    one int64 key per segment.
+    """
+    key = (x1.astype(np.int64) & 0xFFFF) << 48
+    key |= (y1.astype(np.int64) & 0xFFFF) << 32
+    key |= (x2.astype(np.int64) & 0xFFFF) << 16
+    key |= y2.astype(np.int64) & 0xFFFF
+    _, first_from_end = np.unique(key[::-1], return_index=True)
+    return np.sort(len(key) - 1 - first_from_end)
+
+
+def _rasterize_lines(
+    canvas: np.ndarray,
+    x1: np.ndarray, y1: np.ndarray,
+    x2: np.ndarray, y2: np.ndarray,
+    colors: np.ndarray,
+    palette: np.ndarray,
+    width: int = 1,
+) -> None:
+    """Draw many line segments into an (H, W, 3) uint8 canvas at once.
+
+    Endpoints are integer pixel coordinates (see ``_to_pixels``).
+    Every segment is expanded into its pixel run with array arithmetic,
+    replacing one ``ImageDraw.line`` call per segment.  Segments paint in
+    array order, so later segments cover earlier ones at every width
+    (including the offset passes of ``width > 1``); segments fully
+    repainted by an identical later one are skipped.  ``colors`` holds
+    1-based palette indices per segment (see ``_color_lookup``).
+
+    Rather than relying on the unspecified order of a fancy-index
+    assignment with repeated indices, each pixel records the highest
+    segment index that touches it via ``np.maximum.at`` in a flat plane,
+    which is resolved to RGB once at the end.
+    """
+    # Only the last of several identical pixel lines survives the painter's
+    # pass, and stacked layers repeat the same rounded endpoints many times
+    # over (hundreds of times in the orthographic views), so the overdrawn
+    # copies are dropped before any pixels are generated.
+    keep = _last_occurrences(x1, y1, x2, y2)
+    if len(keep) < len(x1):
+        x1, y1, x2, y2, colors = (a[keep] for a in (x1, y1, x2, y2, colors))
+
+    h, w = canvas.shape[:2]
+    dx = x2.astype(np.int32) - x1
+    dy = y2.astype(np.int32) - y1
+    steps = np.maximum(np.abs(dx), np.abs(dy))
+    counts = steps + 1
+    # Per-segment fixed-point start (pre-biased by 0.5 for rounding) and
+    # slope: the per-pixel work is then one multiply-add and a shift, with
+    # no float conversion or rounding call.
+    step_x = (dx << FIXED_SHIFT) // np.maximum(steps, 1)
+    step_y = (dy << FIXED_SHIFT) // np.maximum(steps, 1)
+    half = 1 << (FIXED_SHIFT - 1)
+    fx = (x1.astype(np.int32) << FIXED_SHIFT) + half
+    fy = (y1.astype(np.int32) << FIXED_SHIFT) + half
+    ends = np.cumsum(counts)
+    offsets = range(-(width // 2), width - width // 2)
+
+    # Last (highest-index) segment covering each pixel; -1 means untouched
+    plane = np.full(h * w, -1, dtype=np.int32)
+
+    start = 0
+    while start < len(counts):
+        base = ends[start - 1] if start else 0
+        stop = max(start + 1, int(np.searchsorted(ends, base + RASTER_BATCH_PIXELS, 'right')))
+        c = counts[start:stop]
+        seg = np.repeat(np.arange(start, stop, dtype=np.int32), c)
+        t = np.arange(len(seg), dtype=np.int32) - np.repeat((np.cumsum(c) - c).astype(np.int32), c)
+        xs = (fx[seg] + step_x[seg] * t) >> FIXED_SHIFT
+        ys = (fy[seg] + step_y[seg] * t) >> FIXED_SHIFT
+        for oy in offsets:
+            for ox in offsets:
+                px = xs + ox
+                py = ys + oy
+                keep = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                np.maximum.at(plane, (py * w + px)[keep], seg[keep])
+        start = stop
+
+    plane = plane.reshape(h, w)
+    hit = plane >= 0
+    canvas[hit] = palette[colors[plane[hit]] - 1]
+
+
+def _outline_rect(canvas: np.ndarray, x0: int, y0: int, x1: int, y1: int, color) -> None:
+    """Draw a 1px rectangle outline with slice assignments."""
+    canvas[y0, x0:x1 + 1] = color
+    canvas[y1, x0:x1 + 1] = color
+    canvas[y0:y1 + 1, x0] = color
+    canvas[y0:y1 + 1, x1] = color
+
+
+# ---------------------------------------------------------------------------
+# Panels — each draws into a (H, W, 3) view of the composite canvas
+# ---------------------------------------------------------------------------
+
+def _render_3d_panel(
+    panel: np.ndarray,
+    segments: Segments,
+    colors: np.ndarray,
+    max_z: float,
+    palette: np.ndarray,
+    line_width: int,
+) -> None:
+    """3D perspective view (left panel), painted back-to-front."""
+    main_w = panel.shape[1]
+    margin_3d = main_w * 0.08
+    # Scale to fit bed + height in the panel
+    # The isometric projection spreads: X range ~ bed*cos45, Y range ~ bed*sin45*0.5 + maxZ
+    x_spread = BED_SIZE * 0.7071  # cos45 * bed
+    y_spread = BED_SIZE * 0.7071 * 0.5 + max_z  # depth + height
+    usable_w = main_w - 2 * margin_3d
+    usable_h = main_w - 2 * margin_3d
+    scale_3d = min(usable_w / (x_spread * 2), usable_h / (y_spread * 1.2))
+    # Origin: center of left panel
+    ox_3d = main_w / 2
+    oy_3d = main_w * 0.65  # Push down a bit so tall prints don't clip top
+
+    bed_cx = BED_SIZE / 2
+    bed_cy = BED_SIZE / 2
+
+    # Draw bed outline in 3D
+    bed_x = np.array([0, BED_SIZE, BED_SIZE, 0], dtype=np.float32)
+    bed_y = np.array([0, 0, BED_SIZE, BED_SIZE], dtype=np.float32)
+    bed_px, bed_py = _to_pixels(
+        *_project_iso(bed_x, bed_y, 0, bed_cx, bed_cy, scale_3d, ox_3d, oy_3d, main_w)
+    )
+    _rasterize_lines(panel, bed_px, bed_py, np.roll(bed_px, -1), np.roll(bed_py, -1),
+                     np.ones(4, dtype=np.uint8), np.array([PLATE_COLOR], dtype=np.uint8))
+
+    # Sort segments back-to-front for painter's algorithm (proper occlusion).
+    # In our isometric view (45° rotation), "depth" is -(x+y) after rotation,
+    # plus lower Z should draw first. Sort by ascending depth so far objects
+    # draw first and near objects paint over them.
+    px1, py1 = _project_iso(segments.x1, segments.y1, segments.z1,
+                            bed_cx, bed_cy, scale_3d, ox_3d, oy_3d, main_w)
+    px2, py2 = _project_iso(segments.x2, segments.y2, segments.z2,
+                            bed_cx, bed_cy, scale_3d, ox_3d, oy_3d, main_w)
+    # The depth key (ry2 * 0.5 + z at the segment midpoint) is exactly what
+    # the projection subtracts from oy, scaled, so it falls out of the
+    # projected endpoints: a larger key gives a smaller py1 + py2.  Reuse
+    # them instead of recomputing depth from the raw coordinates.
+    order = np.argsort(-(py1 + py2), kind='stable')
+    px1, py1, px2, py2 = _to_pixels(px1, py1, px2, py2)
+    px1, py1, px2, py2, colors_3d = (
+        a[order] for a in (px1, py1, px2, py2, colors)
+    )
+    del order
+
+    # Draw segments in 3D (back-to-front)
+    _rasterize_lines(panel, px1, py1, px2, py2, colors_3d, palette, line_width)
+
+
+def _render_top_panel(
+    panel: np.ndarray,
+    segments: Segments,
+    colors: np.ndarray,
+    travels: Segments,
+    palette: np.ndarray,
+    line_width: int,
+) -> None:
+    """Top-down orthographic view (top-right panel) with travel moves."""
+    side_h, side_w = panel.shape[:2]
+    top_margin = side_w * 0.08
+    top_usable = min(side_w, side_h) - 2 * top_margin
+    top_scale = top_usable / BED_SIZE
+
+    # Draw bed outline
+    bed_rect = (
+        round(top_margin), round(side_h - top_margin - BED_SIZE * top_scale),
+        round(top_margin + BED_SIZE * top_scale), round(side_h - top_margin),
+    )
+    _outline_rect(panel, *bed_rect, PLATE_COLOR)
+
+    # Draw travels first (underneath extrusions); the parser already kept
+    # only 1 in TRAVEL_DECIMATE to avoid cluttering the panel
+    px1, py1 = _project_top(travels.x1, travels.y1, top_scale, top_margin, side_h)
+    px2, py2 = _project_top(travels.x2, travels.y2, top_scale, top_margin, side_h)
+    px1, py1, px2, py2 = _to_pixels(px1, py1, px2, py2)
+    _rasterize_lines(panel, px1, py1, px2, py2, np.ones(len(travels), dtype=np.uint8),
+                     np.array([TRAVEL_COLOR], dtype=np.uint8))
+
+    # Draw extrusions on top
+    px1, py1 = _project_top(segments.x1, segments.y1, top_scale, top_margin, side_h)
+    px2, py2 = _project_top(segments.x2, segments.y2, top_scale, top_margin, side_h)
+    px1, py1, px2, py2 = _to_pixels(px1, py1, px2, py2)
+    _rasterize_lines(panel, px1, py1, px2, py2, colors, palette, line_width)
+
+    # Re-draw plate outline on top so it's always visible
+    _outline_rect(panel, *bed_rect, PLATE_COLOR)
+
+
+def _render_front_panel(
+    panel: np.ndarray,
+    segments: Segments,
+    colors: np.ndarray,
+    max_z: float,
+    palette: np.ndarray,
+    line_width: int,
+) -> None:
+    """Front orthographic view (bottom-right panel, XZ plane)."""
+    side_h, side_w = panel.shape[:2]
+    front_margin = side_w * 0.10
+    # Scale to fit full bed width (X) and print height (Z) in the panel
+    front_usable_w = side_w - 2 * front_margin
+    front_usable_h = side_h - 2 * front_margin
+    effective_z = max(max_z, 1.0)
+    front_scale = min(front_usable_w / BED_SIZE, front_usable_h / effective_z)
+
+    # Center the bed in the panel horizontally
+    bed_w_px = BED_SIZE * front_scale
+    front_ox_offset = front_margin + (front_usable_w - bed_w_px) / 2
+    front_oy_bottom = side_h - front_margin  # Bottom of panel
+
+    # Draw bed line (full plate width)
+    panel[round(front_oy_bottom),
+          round(front_ox_offset):round(front_ox_offset + bed_w_px) + 1] = PLATE_COLOR
+
+    px1 = front_ox_offset + segments.x1 * front_scale
+    py1 = front_oy_bottom - segments.z1 * front_scale
+    px2 = front_ox_offset + segments.x2 * front_scale
+    py2 = front_oy_bottom - segments.z2 * front_scale
+    px1, py1, px2, py2 = _to_pixels(px1, py1, px2, py2)
+    _rasterize_lines(panel, px1, py1, px2, py2, colors, palette, line_width)
+
+
 # ---------------------------------------------------------------------------
 # Main render function
 # ---------------------------------------------------------------------------
@@ -263,13 +762,11 @@ def render_gcode_image(
         PIL Image with composite multi-angle preview
     """
     tool_colors = _build_tool_colors(filament_colors)
-    TRAVEL_COLOR = (60, 40, 40)  # Dim red-brown for travel moves
-    PLATE_COLOR = (70, 70, 70)   # Plate outline color
 
     # Parse all segments (extrusion + travel)
     segments, travels, max_z = _parse_segments(gcode_path)
 
-    if not segments:
+    if len(segments) == 0:
         # Empty G-code — return placeholder
         img = Image.new('RGB', (int(image_size * 1.5), image_size), background_color)
         draw = ImageDraw.Draw(img)
@@ -279,13 +776,6 @@ def render_gcode_image(
 
     logger.info(f"Parsed {len(segments):,} extrusion + {len(travels):,} travel segments, max Z={max_z:.1f}mm")
 
-    # If too many segments for memory, decimate uniformly
-    MAX_SEGMENTS = 2_000_000
-    if len(segments) > MAX_SEGMENTS:
-        step = len(segments) // MAX_SEGMENTS + 1
-        segments = segments[::step]
-        logger.info(f"Decimated to {len(segments):,} segments (1/{step})")
-
     # --- Layout dimensions ---
     total_w = int(image_size * 1.5)
     total_h = image_size
@@ -293,13 +783,35 @@ def render_gcode_image(
     side_w = total_w - main_w  # Right panels: remaining width
     side_h = total_h // 2      # Each right panel is half height
 
-    img = Image.new('RGB', (total_w, total_h), background_color)
-    draw = ImageDraw.Draw(img)
+    # The composite is owned as one NumPy pixel buffer.  Each panel is a
+    # view into it, so lines, outlines and dividers are written in place
+    # and the PIL image is only wrapped around it at the end (for labels).
+    canvas = np.empty((total_h, total_w, 3), dtype=np.uint8)
+    canvas[:] = background_color
+    palette = np.array(tool_colors, dtype=np.uint8)
+    colors = _color_lookup(segments.tool, len(palette))
+
+    # The three panels are disjoint views of the canvas, so they can be
+    # rasterized concurrently; the NumPy work releases the GIL.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [
+            pool.submit(_render_3d_panel, canvas[:, :main_w],
+                        segments, colors, max_z, palette, line_width),
+            pool.submit(_render_top_panel, canvas[:side_h, main_w:],
+                        segments, colors, travels, palette, line_width),
+            pool.submit(_render_front_panel, canvas[side_h:, main_w:],
+                        segments, colors, max_z, palette, line_width),
+        ]
+        for future in futures:
+            future.result()
 
     # Panel divider lines
     divider_color = (50, 50, 50)
-    draw.line([(main_w, 0), (main_w, total_h)], fill=divider_color, width=1)
-    draw.line([(main_w, side_h), (total_w, side_h)], fill=divider_color, width=1)
+    canvas[:, main_w] = divider_color
+    canvas[side_h, main_w:] = divider_color
+
+    img = Image.fromarray(canvas)
+    draw = ImageDraw.Draw(img)
 
     # --- Panel labels ---
     label_color = (80, 80, 80)
@@ -311,118 +823,5 @@ def render_gcode_image(
     draw.text((main_w + 6, 4), "Top", fill=label_color, font=font)
     draw.text((main_w + 6, side_h + 4), "Front", fill=label_color, font=font)
 
-    # ==================== 3D PERSPECTIVE (left panel) ====================
-    margin_3d = main_w * 0.08
-    # Scale to fit bed + height in the panel
-    # The isometric projection spreads: X range ~ bed*cos45, Y range ~ bed*sin45*0.5 + maxZ
-    x_spread = BED_SIZE * 0.7071  # cos45 * bed
-    y_spread = BED_SIZE * 0.7071 * 0.5 + max_z  # depth + height
-    usable_w = main_w - 2 * margin_3d
-    usable_h = main_w - 2 * margin_3d
-    scale_3d = min(usable_w / (x_spread * 2), usable_h / (y_spread * 1.2))
-    # Origin: center of left panel
-    ox_3d = main_w / 2
-    oy_3d = main_w * 0.65  # Push down a bit so tall prints don't clip top
-
-    bed_cx = BED_SIZE / 2
-    bed_cy = BED_SIZE / 2
-
-    # Draw bed outline in 3D
-    bed_corners = [
-        (0, 0, 0), (BED_SIZE, 0, 0),
-        (BED_SIZE, BED_SIZE, 0), (0, BED_SIZE, 0),
-    ]
-    bed_pts = [_project_iso(bx, by, 0, bed_cx, bed_cy, scale_3d, ox_3d, oy_3d, main_w)
-               for bx, by, _ in bed_corners]
-    for i in range(4):
-        draw.line([bed_pts[i], bed_pts[(i + 1) % 4]], fill=PLATE_COLOR, width=1)
-
-    # Sort segments back-to-front for painter's algorithm (proper occlusion).
-    # In our isometric view (45° rotation), "depth" is -(x+y) after rotation,
-    # plus lower Z should draw first. Sort by ascending depth so far objects
-    # draw first and near objects paint over them.
-    cos45 = 0.7071
-    sin45 = 0.7071
-    def _depth_key(seg):
-        x1, y1, z1, x2, y2, z2, _ = seg
-        mx = (x1 + x2) * 0.5 - bed_cx
-        my = (y1 + y2) * 0.5 - bed_cy
-        mz = (z1 + z2) * 0.5
-        # Depth = how far "into" the screen: ry2 (rotated Y) + Z
-        ry2 = mx * sin45 + my * cos45
-        return ry2 * 0.5 + mz  # match projection formula
-    segments_3d = sorted(segments, key=_depth_key)
-
-    # Draw segments in 3D (back-to-front)
-    for seg in segments_3d:
-        x1, y1, z1, x2, y2, z2, tool = seg
-        color = tool_colors[tool % len(tool_colors)]
-        p1 = _project_iso(x1, y1, z1, bed_cx, bed_cy, scale_3d, ox_3d, oy_3d, main_w)
-        p2 = _project_iso(x2, y2, z2, bed_cx, bed_cy, scale_3d, ox_3d, oy_3d, main_w)
-        draw.line([p1, p2], fill=color, width=line_width)
-    del segments_3d  # Free memory
-
-    # ==================== TOP-DOWN (top-right panel) ====================
-    top_margin = side_w * 0.08
-    top_usable = min(side_w, side_h) - 2 * top_margin
-    top_scale = top_usable / BED_SIZE
-    # Offset: shift into the top-right panel area
-    top_ox = main_w
-    top_oy = 0
-
-    # Draw bed outline
-    bed_tl = (top_ox + top_margin, top_oy + side_h - top_margin - BED_SIZE * top_scale)
-    bed_br = (top_ox + top_margin + BED_SIZE * top_scale, top_oy + side_h - top_margin)
-    draw.rectangle([bed_tl, bed_br], outline=PLATE_COLOR, width=1)
-
-    # Draw travels first (underneath extrusions)
-    for seg in travels:
-        x1, y1, _, x2, y2, _, _ = seg
-        px1 = top_ox + top_margin + x1 * top_scale
-        py1 = top_oy + side_h - top_margin - y1 * top_scale
-        px2 = top_ox + top_margin + x2 * top_scale
-        py2 = top_oy + side_h - top_margin - y2 * top_scale
-        draw.line([(px1, py1), (px2, py2)], fill=TRAVEL_COLOR, width=1)
-
-    # Draw extrusions on top
-    for seg in segments:
-        x1, y1, _, x2, y2, _, tool = seg
-        color = tool_colors[tool % len(tool_colors)]
-        px1 = top_ox + top_margin + x1 * top_scale
-        py1 = top_oy + side_h - top_margin - y1 * top_scale
-        px2 = top_ox + top_margin + x2 * top_scale
-        py2 = top_oy + side_h - top_margin - y2 * top_scale
-        draw.line([(px1, py1), (px2, py2)], fill=color, width=line_width)
-
-    # Re-draw plate outline on top so it's always visible
-    draw.rectangle([bed_tl, bed_br], outline=PLATE_COLOR, width=1)
-
-    # ==================== FRONT VIEW (bottom-right panel) ====================
-    front_margin = side_w * 0.10
-    # Scale to fit full bed width (X) and print height (Z) in the panel
-    front_usable_w = side_w - 2 * front_margin
-    front_usable_h = side_h - 2 * front_margin
-    effective_z = max(max_z, 1.0)
-    front_scale = min(front_usable_w / BED_SIZE, front_usable_h / effective_z)
-
-    # Center the bed in the panel horizontally
-    bed_w_px = BED_SIZE * front_scale
-    front_ox_offset = main_w + front_margin + (front_usable_w - bed_w_px) / 2
-    front_oy_bottom = side_h + side_h - front_margin  # Bottom of panel
-
-    # Draw bed line (full plate width)
-    draw.line([(front_ox_offset, front_oy_bottom),
-               (front_ox_offset + bed_w_px, front_oy_bottom)],
-              fill=PLATE_COLOR, width=1)
-
-    for seg in segments:
-        x1, _, z1, x2, _, z2, tool = seg
-        color = tool_colors[tool % len(tool_colors)]
-        px1 = front_ox_offset + x1 * front_scale
-        py1 = front_oy_bottom - z1 * front_scale
-        px2 = front_ox_offset + x2 * front_scale
-        py2 = front_oy_bottom - z2 * front_scale
-        draw.line([(px1, py1), (px2, py2)], fill=color, width=line_width)
-
     logger.info(f"Rendered {len(segments):,} segments across 3 views")
     return img
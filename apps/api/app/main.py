@@ -1,52 +1,80 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query
-from fastapi.responses import Response
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, Optional, List
 from datetime import datetime, timezone
+from pathlib import Path
+import asyncio
+import hashlib
 import json
+import logging
 import os
+import time
+import orjson
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from db import init_db, close_db, get_pg_pool
+from asyncpg.exceptions import UniqueViolationError
+from db import init_db, close_db, get_pg_pool, ACQUIRE_TIMEOUT
 from moonraker import init_moonraker, close_moonraker, get_moonraker, set_moonraker_url
 from routes_upload import router as upload_router
 from routes_slice import router as slice_router
 from routes_makerworld import router as makerworld_router
 
+logger = logging.getLogger(__name__)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+_STARTER_FILAMENTS = [
+    {"name": "PLA Red", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#FF0000", "extruder_index": 0, "is_default": True, "source_type": "starter"},
+    {"name": "PLA Blue", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#0000FF", "extruder_index": 1, "is_default": False, "source_type": "starter"},
+    {"name": "PLA Green", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#00FF00", "extruder_index": 2, "is_default": False, "source_type": "starter"},
+    {"name": "PLA Yellow", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#FFFF00", "extruder_index": 3, "is_default": False, "source_type": "starter"},
+    {"name": "PETG", "material": "PETG", "nozzle_temp": 240, "bed_temp": 80, "print_speed": 150, "bed_type": "PEI", "color_hex": "#FF6600", "extruder_index": 0, "is_default": False, "source_type": "starter"},
+    {"name": "ABS", "material": "ABS", "nozzle_temp": 250, "bed_temp": 100, "print_speed": 150, "bed_type": "Glass", "color_hex": "#333333", "extruder_index": 0, "is_default": False, "source_type": "starter"},
+    {"name": "TPU", "material": "TPU", "nozzle_temp": 220, "bed_temp": 40, "print_speed": 30, "bed_type": "PEI", "color_hex": "#FF00FF", "extruder_index": 0, "is_default": False, "source_type": "starter"},
+]
+
+_STARTER_COLUMNS = (
+    "name", "material", "nozzle_temp", "bed_temp", "print_speed",
+    "bed_type", "color_hex", "extruder_index", "is_default", "source_type",
+)
+
+
+async def _insert_starter_filaments(conn):
+    """Insert the starter filaments in one statement, skipping existing names."""
+    await conn.execute(
+        """
+        INSERT INTO filaments (name, material, nozzle_temp, bed_temp, print_speed, bed_type, color_hex, extruder_index, is_default, source_type)
+        SELECT * FROM unnest($1::text[], $2::text[], $3::int[], $4::int[], $5::int[], $6::text[], $7::text[], $8::int[], $9::bool[], $10::text[])
+        ON CONFLICT (name) DO NOTHING
+        """,
+        *([f[col] for f in _STARTER_FILAMENTS] for col in _STARTER_COLUMNS),
+    )
+
 
 async def _auto_init_filaments():
     """Auto-initialize default filaments if the library is empty (first run)."""
     pool = get_pg_pool()
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         count = await conn.fetchval("SELECT COUNT(*) FROM filaments")
         if count > 0:
             return
 
         print("Filament library empty — initializing starter filaments...")
-        default_filaments = [
-            {"name": "PLA Red", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#FF0000", "extruder_index": 0, "is_default": True, "source_type": "starter"},
-            {"name": "PLA Blue", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#0000FF", "extruder_index": 1, "is_default": False, "source_type": "starter"},
-            {"name": "PLA Green", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#00FF00", "extruder_index": 2, "is_default": False, "source_type": "starter"},
-            {"name": "PLA Yellow", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#FFFF00", "extruder_index": 3, "is_default": False, "source_type": "starter"},
-            {"name": "PETG", "material": "PETG", "nozzle_temp": 240, "bed_temp": 80, "print_speed": 150, "bed_type": "PEI", "color_hex": "#FF6600", "extruder_index": 0, "is_default": False, "source_type": "starter"},
-            {"name": "ABS", "material": "ABS", "nozzle_temp": 250, "bed_temp": 100, "print_speed": 150, "bed_type": "Glass", "color_hex": "#333333", "extruder_index": 0, "is_default": False, "source_type": "starter"},
-            {"name": "TPU", "material": "TPU", "nozzle_temp": 220, "bed_temp": 40, "print_speed": 30, "bed_type": "PEI", "color_hex": "#FF00FF", "extruder_index": 0, "is_default": False, "source_type": "starter"},
-        ]
-        for f in default_filaments:
-            try:
-                await conn.execute(
-                    """INSERT INTO filaments (name, material, nozzle_temp, bed_temp, print_speed, bed_type, color_hex, extruder_index, is_default, source_type)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                    ON CONFLICT (name) DO NOTHING""",
-                    f["name"], f["material"], f["nozzle_temp"], f["bed_temp"],
-                    f["print_speed"], f["bed_type"], f["color_hex"], f["extruder_index"], f["is_default"], f["source_type"]
-                )
-            except Exception as e:
-                print(f"Warning: Failed to insert starter filament {f['name']}: {e}")
-        print(f"Initialized {len(default_filaments)} starter filaments")
+        try:
+            await _insert_starter_filaments(conn)
+        except Exception as e:
+            print(f"Warning: Failed to insert starter filaments: {e}")
+            return
+        print(f"Initialized {len(_STARTER_FILAMENTS)} starter filaments")
 
 
 @asynccontextmanager
@@ -55,13 +83,14 @@ async def lifespan(app: FastAPI):
     await init_db()
     await init_moonraker(pool=get_pg_pool())
     await _auto_init_filaments()
+    await _ensure_preset_rows()
     yield
     # Shutdown
     await close_moonraker()
     await close_db()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS — default to allow all origins for LAN-first use (no auth).
 # Set ALLOWED_ORIGINS env var (comma-separated) to restrict if needed.
@@ -84,32 +113,39 @@ app.include_router(slice_router)
 app.include_router(makerworld_router)
 
 
-@app.get("/")
-def root():
-    return {
-        "name": "U1 Slicer Bridge API",
-        "version": os.getenv("APP_VERSION", "dev"),
-        "web_ui": "http://localhost:8080",
-        "endpoints": {
-            "health": "/healthz",
-            "printer": "/printer/status",
-            "printer_settings": "GET/PUT /printer/settings",
-            "send_to_printer": "POST /printer/print",
-            "print_status": "GET /printer/print/status",
-            "pause_print": "POST /printer/pause",
-            "resume_print": "POST /printer/resume",
-            "cancel_print": "POST /printer/cancel",
-            "upload": "POST /upload",
-            "uploads": "GET /upload",
-            "slice": "POST /uploads/{id}/slice",
-            "job_status": "GET /jobs/{job_id}"
-        }
+# Static bodies for the root and health endpoints, serialized once at import
+# (liveness probes hit these constantly).  The handlers are async so they run
+# inline on the event loop instead of being dispatched to the threadpool.
+_ROOT_BODY = orjson.dumps({
+    "name": "U1 Slicer Bridge API",
+    "version": os.getenv("APP_VERSION", "dev"),
+    "web_ui": "http://localhost:8080",
+    "endpoints": {
+        "health": "/healthz",
+        "printer": "/printer/status",
+        "printer_settings": "GET/PUT /printer/settings",
+        "send_to_printer": "POST /printer/print",
+        "print_status": "GET /printer/print/status",
+        "pause_print": "POST /printer/pause",
+        "resume_print": "POST /printer/resume",
+        "cancel_print": "POST /printer/cancel",
+        "upload": "POST /upload",
+        "uploads": "GET /upload",
+        "slice": "POST /uploads/{id}/slice",
+        "job_status": "GET /jobs/{job_id}"
     }
+})
+_HEALTH_BODY = orjson.dumps({"status": "ok", "version": os.getenv("APP_VERSION", "dev")})
+
+
+@app.get("/")
+async def root():
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/healthz")
-def health():
-    return {"status": "ok", "version": os.getenv("APP_VERSION", "dev")}
+async def health():
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/printer/status")
@@ -123,40 +159,41 @@ async def printer_status(include_webcams: bool = False):
             "message": "Moonraker not configured. Set printer URL in Settings."
         }
 
-    is_healthy = await client.health_check()
-    if not is_healthy:
+    # The Moonraker queries are independent, so issue them concurrently: one
+    # round-trip of latency instead of four.  A failed server.info doubles
+    # as the reachability check (it is exactly what health_check() calls).
+    async def _no_webcams():
+        return []
+
+    server_info, printer_info, print_status, webcams = await asyncio.gather(
+        client.get_server_info(),
+        client.get_printer_info(),
+        client.query_print_status(include_filament_config=True),
+        client.get_webcams() if include_webcams else _no_webcams(),
+        return_exceptions=True,
+    )
+
+    if isinstance(server_info, BaseException):
         return {
             "connected": False,
             "message": "Cannot reach Moonraker. Check printer network connection."
         }
+    if isinstance(printer_info, BaseException):
+        raise HTTPException(status_code=503, detail=f"Printer error: {str(printer_info)}")
 
-    try:
-        server_info = await client.get_server_info()
-        printer_info = await client.get_printer_info()
-
-        # Also query print status for header display
+    # Print status and webcams are non-critical
+    if isinstance(print_status, BaseException):
         print_status = None
+    if isinstance(webcams, BaseException):
         webcams = []
-        try:
-            print_status = await client.query_print_status(include_filament_config=True)
-        except Exception:
-            pass  # Non-critical
-
-        if include_webcams:
-            try:
-                webcams = await client.get_webcams()
-            except Exception:
-                webcams = []  # Non-critical
 
-        return {
-            "connected": True,
-            "server": server_info.get("result", {}),
-            "printer": printer_info.get("result", {}),
-            "print_status": print_status,
-            "webcams": webcams,
-        }
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Printer error: {str(e)}")
+    return {
+        "connected": True,
+        "server": server_info.get("result", {}),
+        "printer": printer_info.get("result", {}),
+        "print_status": print_status,
+        "webcams": webcams,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -167,7 +204,7 @@ async def printer_status(include_webcams: bool = False):
 async def get_printer_settings():
     """Get printer connection settings."""
     pool = get_pg_pool()
-    async with pool.acquire() as conn:
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         row = await conn.fetchrow("SELECT moonraker_url, makerworld_cookies, makerworld_enabled FROM printer_settings WHERE id = 1")
     return {
         "moonraker_url": row["moonraker_url"] if row else None,
@@ -190,7 +227,7 @@ async def update_printer_settings(body: PrinterSettingsUpdate):
     sent_cookies = body.makerworld_cookies is not None
     mw_cookies = body.makerworld_cookies.strip() if body.makerworld_cookies else None
 
-    async with pool.acquire() as conn:
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         if sent_cookies:
             # User explicitly sent cookies (new value or empty = clear)
             await conn.execute(
@@ -223,7 +260,7 @@ async def update_printer_settings(body: PrinterSettingsUpdate):
     await set_moonraker_url(url or "")
 
     # Read back current makerworld_enabled
-    async with pool.acquire() as conn:
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         row = await conn.fetchrow("SELECT makerworld_enabled FROM printer_settings WHERE id = 1")
     mw_enabled = bool(row and row["makerworld_enabled"])
 
@@ -242,6 +279,14 @@ async def update_printer_settings(body: PrinterSettingsUpdate):
 class PrintRequest(BaseModel):
     job_id: str
 
+
+def _log_printer_action(message: str):
+    """on_complete hook: log a printer action once Moonraker has accepted it."""
+    async def _log(result: Dict[str, Any]):
+        logger.info("%s (moonraker: %s)", message, result.get("result", result))
+    return _log
+
+
 @app.post("/printer/print")
 async def send_to_printer(body: PrintRequest):
     """Upload G-code to Moonraker and start printing."""
@@ -263,7 +308,7 @@ async def send_to_printer(body: PrintRequest):
 
     # Look up the G-code file from the job
     pool = get_pg_pool()
-    async with pool.acquire() as conn:
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         job = await conn.fetchrow(
             "SELECT gcode_path, status FROM slicing_jobs WHERE job_id = $1",
             body.job_id,
@@ -274,7 +319,6 @@ async def send_to_printer(body: PrintRequest):
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail="Job not completed")
 
-    from pathlib import Path
     gcode_path = Path(job["gcode_path"])
     if not gcode_path.exists():
         raise HTTPException(status_code=404, detail="G-code file not found on disk")
@@ -282,8 +326,11 @@ async def send_to_printer(body: PrintRequest):
     filename = f"{body.job_id}.gcode"
 
     try:
-        await client.upload_gcode(str(gcode_path), filename)
-        await client.start_print(filename)
+        await client.upload_gcode(
+            str(gcode_path), filename,
+            on_complete=_log_printer_action(f"Uploaded {filename} for job {body.job_id}"),
+        )
+        await client.start_print(filename, on_complete=_log_printer_action(f"Started print {filename}"))
         return {"status": "printing", "filename": filename, "message": "Print started"}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to send to printer: {str(e)}")
@@ -309,7 +356,7 @@ async def pause_print():
     if not client:
         raise HTTPException(status_code=503, detail="Printer not configured")
     try:
-        await client.pause_print()
+        await client.pause_print(on_complete=_log_printer_action("Paused print"))
         return {"status": "paused", "message": "Print paused"}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to pause: {str(e)}")
@@ -322,7 +369,7 @@ async def resume_print():
     if not client:
         raise HTTPException(status_code=503, detail="Printer not configured")
     try:
-        await client.resume_print()
+        await client.resume_print(on_complete=_log_printer_action("Resumed print"))
         return {"status": "printing", "message": "Print resumed"}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to resume: {str(e)}")
@@ -335,27 +382,16 @@ async def cancel_print():
     if not client:
         raise HTTPException(status_code=503, detail="Printer not configured")
     try:
-        await client.cancel_print()
+        await client.cancel_print(on_complete=_log_printer_action("Cancelled print"))
         return {"status": "cancelled", "message": "Print cancelled"}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to cancel: {str(e)}")
 
 
-class FilamentCreate(BaseModel):
-    name: str
-    material: str
-    nozzle_temp: int = Field(..., ge=100, le=400)
-    bed_temp: int = Field(..., ge=0, le=150)
-    print_speed: Optional[int] = Field(60, ge=5, le=600)
-    bed_type: str = "PEI"
-    color_hex: str = "#FFFFFF"
-    extruder_index: int = Field(0, ge=0, le=3)
-    is_default: bool = False
-    source_type: str = "manual"
-    density: Optional[float] = Field(1.24, ge=0.5, le=5.0)
-
+class FilamentIn(BaseModel):
+    """Request body for creating or updating a filament profile."""
+    model_config = ConfigDict(extra="ignore")
 
-class FilamentUpdate(BaseModel):
     name: str
     material: str
     nozzle_temp: int = Field(..., ge=100, le=400)
@@ -369,12 +405,6 @@ class FilamentUpdate(BaseModel):
     density: Optional[float] = Field(1.24, ge=0.5, le=5.0)
 
 
-async def _ensure_filament_schema(conn):
-    await conn.execute("ALTER TABLE filaments ADD COLUMN IF NOT EXISTS source_type TEXT DEFAULT 'manual'")
-    await conn.execute("ALTER TABLE filaments ADD COLUMN IF NOT EXISTS slicer_settings TEXT")
-    await conn.execute("ALTER TABLE filaments ADD COLUMN IF NOT EXISTS density REAL DEFAULT 1.24")
-
-
 class ExtruderPreset(BaseModel):
     slot: int
     filament_id: Optional[int] = None
@@ -382,6 +412,8 @@ class ExtruderPreset(BaseModel):
 
 
 class SlicingDefaults(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     layer_height: float = 0.2
     infill_density: int = 15
     wall_count: int = 3
@@ -413,146 +445,152 @@ class ExtruderPresetUpdate(BaseModel):
     slicing_defaults: Optional[SlicingDefaults] = None
 
 
-async def _ensure_preset_rows(conn):
-    await conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS extruder_presets (
-            slot INTEGER PRIMARY KEY,
-            filament_id INTEGER REFERENCES filaments(id) ON DELETE SET NULL,
-            color_hex VARCHAR(7) NOT NULL DEFAULT '#FFFFFF',
-            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
-            CONSTRAINT chk_extruder_preset_slot CHECK (slot BETWEEN 1 AND 4)
-        )
-        """
-    )
-
-    await conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS slicing_defaults (
-            id INTEGER PRIMARY KEY,
-            layer_height REAL NOT NULL DEFAULT 0.2,
-            infill_density INTEGER NOT NULL DEFAULT 15,
-            wall_count INTEGER NOT NULL DEFAULT 3,
-            infill_pattern TEXT NOT NULL DEFAULT 'gyroid',
-            supports BOOLEAN NOT NULL DEFAULT FALSE,
-            enable_prime_tower BOOLEAN NOT NULL DEFAULT FALSE,
-            prime_volume INTEGER,
-            prime_tower_width INTEGER,
-            prime_tower_brim_width INTEGER,
-            prime_tower_brim_chamfer BOOLEAN NOT NULL DEFAULT TRUE,
-            prime_tower_brim_chamfer_max_width INTEGER,
-            nozzle_temp INTEGER,
-            bed_temp INTEGER,
-            bed_type TEXT,
-            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
-            CONSTRAINT chk_slicing_defaults_single_row CHECK (id = 1)
-        )
-        """
-    )
-
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS enable_prime_tower BOOLEAN NOT NULL DEFAULT FALSE")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_volume INTEGER")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_width INTEGER")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_brim_width INTEGER")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_brim_chamfer BOOLEAN NOT NULL DEFAULT TRUE")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_brim_chamfer_max_width INTEGER")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS support_type TEXT")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS support_threshold_angle INTEGER")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS brim_type TEXT")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS brim_width REAL")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS brim_object_gap REAL")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS skirt_loops INTEGER")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS skirt_distance REAL")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS skirt_height INTEGER")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS setting_modes TEXT")
-    await conn.execute("ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS enable_flow_calibrate BOOLEAN NOT NULL DEFAULT TRUE")
-
-    for slot in range(1, 5):
-        fallback_filament_id = await conn.fetchval(
-            """
-            SELECT id FROM filaments
-            WHERE extruder_index = $1
-            ORDER BY is_default DESC, id ASC
-            LIMIT 1
-            """,
-            slot - 1,
-        )
+async def _ensure_preset_rows():
+    """Seed the E1-E4 preset slots and the slicing defaults row (startup only)."""
+    pool = get_pg_pool()
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         await conn.execute(
             """
             INSERT INTO extruder_presets (slot, filament_id, color_hex)
-            VALUES ($1, $2, '#FFFFFF')
+            SELECT s, (
+                SELECT id FROM filaments
+                WHERE extruder_index = s - 1
+                ORDER BY is_default DESC, id ASC
+                LIMIT 1
+            ), '#FFFFFF'
+            FROM generate_series(1, 4) AS s
             ON CONFLICT (slot) DO NOTHING
-            """,
-            slot,
-            fallback_filament_id,
+            """
+        )
+        await conn.execute(
+            """
+            INSERT INTO slicing_defaults (id)
+            VALUES (1)
+            ON CONFLICT (id) DO NOTHING
+            """
         )
 
-    await conn.execute(
-        """
-        INSERT INTO slicing_defaults (id)
-        VALUES (1)
-        ON CONFLICT (id) DO NOTHING
-        """
-    )
+
+# Short-lived cache of serialized GET bodies for the filament/preset library,
+# which the UI re-reads on every render but which rarely changes.
+# key -> (expires_at, etag, body).  Writes bump the generation so a read that
+# raced with a write never stores its (possibly stale) result.
+_RESPONSE_CACHE_TTL = 5.0
+_response_cache: dict = {}
+_response_cache_generation = 0
+
+
+def _invalidate_response_cache():
+    global _response_cache_generation
+    _response_cache_generation += 1
+    _response_cache.clear()
+
+
+def _etag_response(request: Request, etag: str, body: bytes) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _cached_response(key: str, request: Request) -> Optional[Response]:
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return _etag_response(request, entry[1], entry[2])
+
+
+def _cache_response(key: str, request: Request, content, generation: int) -> Response:
+    """Cache and serve ``content`` (a JSON-able object or an already serialized body)."""
+    if isinstance(content, bytes):
+        body = content
+    else:
+        body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    if generation == _response_cache_generation:
+        _response_cache[key] = (time.monotonic() + _RESPONSE_CACHE_TTL, etag, body)
+    return _etag_response(request, etag, body)
+
+
+# In-flight library loads, so a burst of identical GETs shares one query
+_inflight_loads: dict = {}
+
+
+async def _coalesce(key: str, loader):
+    """Run ``loader`` once for every concurrent caller with the same key.
+
+    Returns ``(generation, result)`` where generation is the cache generation
+    observed when the shared load started.
+    """
+    task = _inflight_loads.get(key)
+    if task is None:
+        async def run():
+            generation = _response_cache_generation
+            return generation, await loader()
+
+        task = asyncio.ensure_future(run())
+        _inflight_loads[key] = task
+        task.add_done_callback(lambda _: _inflight_loads.pop(key, None))
+    # Shielded so one client disconnecting doesn't cancel the others' load
+    return await asyncio.shield(task)
+
+
+async def _serve_cached(key: str, request: Request, loader) -> Response:
+    cached = _cached_response(key, request)
+    if cached is not None:
+        return cached
+    generation, content = await _coalesce(key, loader)
+    return _cache_response(key, request, content, generation)
 
 
 @app.get("/filaments")
-async def get_filaments():
+async def get_filaments(request: Request):
     """Get all configured filament profiles."""
-    from db import get_pg_pool
+    return await _serve_cached("filaments", request, _load_filaments)
+
+
+async def _load_filaments() -> bytes:
     pool = get_pg_pool()
 
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
-        rows = await conn.fetch(
+    # Postgres builds the whole listing as one JSON array (fallbacks and
+    # derived fields included), so the body is spliced together without
+    # materializing a Python object per row.
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
+        listing = await conn.fetchval(
             """
-            SELECT id, name, material, nozzle_temp, bed_temp, print_speed, bed_type, color_hex, extruder_index, is_default, source_type, slicer_settings, density
+            SELECT COALESCE(json_agg(json_build_object(
+                       'id', id,
+                       'name', name,
+                       'material', material,
+                       'nozzle_temp', nozzle_temp,
+                       'bed_temp', bed_temp,
+                       'print_speed', print_speed,
+                       'bed_type', COALESCE(NULLIF(bed_type, ''), 'PEI'),
+                       'color_hex', COALESCE(NULLIF(color_hex, ''), '#FFFFFF'),
+                       'extruder_index', COALESCE(extruder_index, 0),
+                       'is_default', is_default,
+                       'source_type', COALESCE(NULLIF(source_type, ''), 'manual'),
+                       'has_slicer_settings', COALESCE(slicer_settings, '') <> '',
+                       'density', COALESCE(ROUND(density::numeric, 2)::float8, 1.24)
+                   ) ORDER BY is_default DESC, sort_rank, name), '[]')
             FROM filaments
-            ORDER BY is_default DESC,
-                     CASE WHEN UPPER(material) = 'PLA' THEN 0 ELSE 1 END,
-                     name
             """
         )
 
-        filaments = [
-            {
-                "id": row["id"],
-                "name": row["name"],
-                "material": row["material"],
-                "nozzle_temp": row["nozzle_temp"],
-                "bed_temp": row["bed_temp"],
-                "print_speed": row["print_speed"],
-                "bed_type": row["bed_type"] or "PEI",
-                "color_hex": row["color_hex"] or "#FFFFFF",
-                "extruder_index": row["extruder_index"] or 0,
-                "is_default": row["is_default"],
-                "source_type": row["source_type"] or "manual",
-                "has_slicer_settings": bool(row["slicer_settings"]),
-                "density": round(float(row["density"]), 2) if row["density"] is not None else 1.24,
-            }
-            for row in rows
-        ]
-
-        return {"filaments": filaments}
+    return b'{"filaments":' + listing.encode() + b'}'
 
 
 @app.get("/presets/extruders")
-async def get_extruder_presets():
+async def get_extruder_presets(request: Request):
     """Get extruder presets and default slicing settings."""
-    from db import get_pg_pool
-    pool = get_pg_pool()
+    return await _serve_cached("presets", request, _load_extruder_presets)
 
-    async with pool.acquire() as conn:
-        await _ensure_preset_rows(conn)
 
-        preset_rows = await conn.fetch(
-            """
-            SELECT slot, filament_id, color_hex
-            FROM extruder_presets
-            ORDER BY slot
-            """
-        )
+async def _load_extruder_presets() -> dict:
+    pool = get_pg_pool()
 
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
+        # One round-trip: the preset slots ride along as a JSON array column.
         defaults = await conn.fetchrow(
             """
             SELECT layer_height, infill_density, wall_count, infill_pattern,
@@ -563,7 +601,15 @@ async def get_extruder_presets():
                    support_type, support_threshold_angle,
                    brim_type, brim_width, brim_object_gap,
                    skirt_loops, skirt_distance, skirt_height,
-                   setting_modes
+                   setting_modes,
+                   (
+                       SELECT json_agg(json_build_object(
+                                  'slot', slot,
+                                  'filament_id', filament_id,
+                                  'color_hex', COALESCE(color_hex, '#FFFFFF')
+                              ) ORDER BY slot)
+                       FROM extruder_presets
+                   ) AS extruders
             FROM slicing_defaults
             WHERE id = 1
             """
@@ -577,14 +623,7 @@ async def get_extruder_presets():
             pass
 
     return {
-        "extruders": [
-            {
-                "slot": row["slot"],
-                "filament_id": row["filament_id"],
-                "color_hex": row["color_hex"] or "#FFFFFF",
-            }
-            for row in preset_rows
-        ],
+        "extruders": orjson.loads(defaults["extruders"]) if defaults["extruders"] else [],
         "slicing_defaults": {
             "layer_height": round(float(defaults["layer_height"]), 3) if defaults["layer_height"] is not None else 0.2,
             "infill_density": defaults["infill_density"],
@@ -617,7 +656,6 @@ async def get_extruder_presets():
 @app.put("/presets/extruders")
 async def update_extruder_presets(payload: ExtruderPresetUpdate):
     """Update extruder presets and optional global slicing defaults."""
-    from db import get_pg_pool
     pool = get_pg_pool()
 
     if len(payload.extruders) != 4:
@@ -627,11 +665,47 @@ async def update_extruder_presets(payload: ExtruderPresetUpdate):
     if slots != [1, 2, 3, 4]:
         raise HTTPException(status_code=400, detail="Extruder preset slots must be exactly [1,2,3,4].")
 
-    async with pool.acquire() as conn:
-        await _ensure_preset_rows(conn)
+    # Build every statement argument up front so the pooled connection is
+    # only held for the SQL itself.
+    requested_ids = [p.filament_id for p in payload.extruders if p.filament_id is not None]
+    preset_columns = (
+        [p.slot for p in payload.extruders],
+        [p.filament_id for p in payload.extruders],
+        [p.color_hex for p in payload.extruders],
+    )
+    defaults_args = None
+    if payload.slicing_defaults is not None:
+        d = payload.slicing_defaults
+        defaults_args = (
+            1,
+            d.layer_height,
+            d.infill_density,
+            d.wall_count,
+            d.infill_pattern,
+            d.supports,
+            d.support_type,
+            d.support_threshold_angle,
+            d.brim_type,
+            d.brim_width,
+            d.brim_object_gap,
+            d.skirt_loops,
+            d.skirt_distance,
+            d.skirt_height,
+            d.enable_prime_tower,
+            d.prime_volume,
+            d.prime_tower_width,
+            d.prime_tower_brim_width,
+            d.prime_tower_brim_chamfer,
+            d.prime_tower_brim_chamfer_max_width,
+            d.enable_flow_calibrate,
+            d.nozzle_temp,
+            d.bed_temp,
+            d.bed_type,
+            json.dumps(d.setting_modes) if d.setting_modes else None,
+        )
 
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         # Validate filament IDs exist when provided.
-        requested_ids = [p.filament_id for p in payload.extruders if p.filament_id is not None]
         if requested_ids:
             found = await conn.fetch(
                 "SELECT id FROM filaments WHERE id = ANY($1)",
@@ -642,24 +716,20 @@ async def update_extruder_presets(payload: ExtruderPresetUpdate):
             if missing:
                 raise HTTPException(status_code=404, detail=f"Filament IDs not found: {missing}")
 
-        for preset in payload.extruders:
-            await conn.execute(
-                """
-                INSERT INTO extruder_presets (slot, filament_id, color_hex, updated_at)
-                VALUES ($1, $2, $3, NOW())
-                ON CONFLICT (slot) DO UPDATE SET
-                    filament_id = EXCLUDED.filament_id,
-                    color_hex = EXCLUDED.color_hex,
-                    updated_at = NOW()
-                """,
-                preset.slot,
-                preset.filament_id,
-                preset.color_hex,
-            )
+        await conn.execute(
+            """
+            INSERT INTO extruder_presets (slot, filament_id, color_hex, updated_at)
+            SELECT slot, filament_id, color_hex, NOW()
+            FROM unnest($1::int[], $2::int[], $3::text[]) AS p(slot, filament_id, color_hex)
+            ON CONFLICT (slot) DO UPDATE SET
+                filament_id = EXCLUDED.filament_id,
+                color_hex = EXCLUDED.color_hex,
+                updated_at = NOW()
+            """,
+            *preset_columns,
+        )
 
-        if payload.slicing_defaults is not None:
-            d = payload.slicing_defaults
-            setting_modes_json = json.dumps(d.setting_modes) if d.setting_modes else None
+        if defaults_args is not None:
             await conn.execute(
                 """
                 INSERT INTO slicing_defaults (
@@ -700,40 +770,16 @@ async def update_extruder_presets(payload: ExtruderPresetUpdate):
                     setting_modes = EXCLUDED.setting_modes,
                     updated_at = NOW()
                 """,
-                1,
-                d.layer_height,
-                d.infill_density,
-                d.wall_count,
-                d.infill_pattern,
-                d.supports,
-                d.support_type,
-                d.support_threshold_angle,
-                d.brim_type,
-                d.brim_width,
-                d.brim_object_gap,
-                d.skirt_loops,
-                d.skirt_distance,
-                d.skirt_height,
-                d.enable_prime_tower,
-                d.prime_volume,
-                d.prime_tower_width,
-                d.prime_tower_brim_width,
-                d.prime_tower_brim_chamfer,
-                d.prime_tower_brim_chamfer_max_width,
-                d.enable_flow_calibrate,
-                d.nozzle_temp,
-                d.bed_temp,
-                d.bed_type,
-                setting_modes_json,
+                *defaults_args,
             )
 
+    _invalidate_response_cache()
     return {"message": "Extruder presets updated"}
 
 
 @app.get("/presets/orca-defaults")
 def get_orca_defaults():
     """Return Orca process profile defaults for UI display."""
-    from pathlib import Path
     profile_path = Path(__file__).parent / "orca_profiles" / "process" / "0.20mm Standard @Snapmaker U1.json"
     try:
         with open(profile_path) as f:
@@ -757,123 +803,127 @@ def get_orca_defaults():
 
 
 @app.post("/filaments")
-async def create_filament(filament: FilamentCreate):
+async def create_filament(filament: FilamentIn):
     """Create a new filament profile."""
-    from db import get_pg_pool
     pool = get_pg_pool()
 
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
-        async with conn.transaction():
-            if filament.is_default:
-                await conn.execute("UPDATE filaments SET is_default = FALSE WHERE is_default = TRUE")
-
-            try:
-                result = await conn.fetchrow(
-                    """
-                    INSERT INTO filaments (name, material, nozzle_temp, bed_temp, print_speed, bed_type, color_hex, extruder_index, is_default, source_type, density)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                    RETURNING id
-                    """,
-                    filament.name,
-                    filament.material,
-                    filament.nozzle_temp,
-                    filament.bed_temp,
-                    filament.print_speed,
-                    filament.bed_type,
-                    filament.color_hex,
-                    filament.extruder_index,
-                    filament.is_default,
-                    filament.source_type,
-                    filament.density,
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
+        # A new default clears the old one in the same statement
+        try:
+            result = await conn.fetchrow(
+                """
+                WITH cleared AS (
+                    UPDATE filaments SET is_default = FALSE
+                    WHERE $9 AND is_default = TRUE
                 )
-            except Exception as e:
-                if "duplicate key" in str(e).lower() or "unique" in str(e).lower():
-                    raise HTTPException(status_code=409, detail="Filament name already exists")
-                raise
+                INSERT INTO filaments (name, material, nozzle_temp, bed_temp, print_speed, bed_type, color_hex, extruder_index, is_default, source_type, density)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+                RETURNING id
+                """,
+                filament.name,
+                filament.material,
+                filament.nozzle_temp,
+                filament.bed_temp,
+                filament.print_speed,
+                filament.bed_type,
+                filament.color_hex,
+                filament.extruder_index,
+                filament.is_default,
+                filament.source_type,
+                filament.density,
+            )
+        except UniqueViolationError:
+            raise HTTPException(status_code=409, detail="Filament name already exists")
 
+        _invalidate_response_cache()
         return {"id": result["id"], "message": "Filament created"}
 
 
 @app.put("/filaments/{filament_id}")
-async def update_filament(filament_id: int, filament: FilamentUpdate):
+async def update_filament(filament_id: int, filament: FilamentIn):
     """Update a filament profile."""
-    from db import get_pg_pool
     pool = get_pg_pool()
 
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
-        async with conn.transaction():
-            existing = await conn.fetchrow("SELECT id FROM filaments WHERE id = $1", filament_id)
-            if not existing:
-                raise HTTPException(status_code=404, detail="Filament not found")
-
-            if filament.is_default:
-                await conn.execute("UPDATE filaments SET is_default = FALSE WHERE id != $1", filament_id)
-
-            try:
-                await conn.execute(
-                    """
-                    UPDATE filaments
-                    SET name = $1,
-                        material = $2,
-                        nozzle_temp = $3,
-                        bed_temp = $4,
-                        print_speed = $5,
-                        bed_type = $6,
-                        color_hex = $7,
-                        extruder_index = $8,
-                        is_default = $9,
-                        source_type = $10,
-                        density = $11
-                    WHERE id = $12
-                    """,
-                    filament.name,
-                    filament.material,
-                    filament.nozzle_temp,
-                    filament.bed_temp,
-                    filament.print_speed,
-                    filament.bed_type,
-                    filament.color_hex,
-                    filament.extruder_index,
-                    filament.is_default,
-                    filament.source_type,
-                    filament.density,
-                    filament_id,
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
+        # A new default clears the old one in the same statement; RETURNING
+        # reports whether the filament exists.
+        try:
+            updated = await conn.fetchval(
+                """
+                WITH cleared AS (
+                    UPDATE filaments SET is_default = FALSE
+                    WHERE $9 AND is_default = TRUE AND id != $12
+                      AND EXISTS (SELECT 1 FROM filaments WHERE id = $12)
                 )
-            except Exception as e:
-                if "duplicate key" in str(e).lower() or "unique" in str(e).lower():
-                    raise HTTPException(status_code=409, detail="Filament name already exists")
-                raise
+                UPDATE filaments
+                SET name = $1,
+                    material = $2,
+                    nozzle_temp = $3,
+                    bed_temp = $4,
+                    print_speed = $5,
+                    bed_type = $6,
+                    color_hex = $7,
+                    extruder_index = $8,
+                    is_default = $9,
+                    source_type = $10,
+                    density = $11
+                WHERE id = $12
+                RETURNING id
+                """,
+                filament.name,
+                filament.material,
+                filament.nozzle_temp,
+                filament.bed_temp,
+                filament.print_speed,
+                filament.bed_type,
+                filament.color_hex,
+                filament.extruder_index,
+                filament.is_default,
+                filament.source_type,
+                filament.density,
+                filament_id,
+            )
+        except UniqueViolationError:
+            raise HTTPException(status_code=409, detail="Filament name already exists")
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Filament not found")
 
+    _invalidate_response_cache()
     return {"message": "Filament updated"}
 
 
 @app.post("/filaments/{filament_id}/default")
 async def set_default_filament(filament_id: int):
     """Set one filament as the default fallback filament."""
-    from db import get_pg_pool
     pool = get_pg_pool()
 
-    async with pool.acquire() as conn:
-        async with conn.transaction():
-            existing = await conn.fetchrow("SELECT id FROM filaments WHERE id = $1", filament_id)
-            if not existing:
-                raise HTTPException(status_code=404, detail="Filament not found")
-
-            await conn.execute("UPDATE filaments SET is_default = FALSE")
-            await conn.execute("UPDATE filaments SET is_default = TRUE WHERE id = $1", filament_id)
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
+        # Flip is_default in one statement, writing only the rows that change
+        exists = await conn.fetchval(
+            """
+            WITH target AS (SELECT id FROM filaments WHERE id = $1),
+                 flipped AS (
+                     UPDATE filaments SET is_default = (id = $1)
+                     WHERE EXISTS (SELECT 1 FROM target)
+                       AND is_default IS DISTINCT FROM (id = $1)
+                 )
+            SELECT EXISTS (SELECT 1 FROM target)
+            """,
+            filament_id,
+        )
+    if not exists:
+        raise HTTPException(status_code=404, detail="Filament not found")
 
+    _invalidate_response_cache()
     return {"message": "Default filament updated"}
 
 
 @app.delete("/filaments/{filament_id}")
 async def delete_filament(filament_id: int):
     """Delete a filament profile with safety checks."""
-    from db import get_pg_pool
     pool = get_pg_pool()
 
-    async with pool.acquire() as conn:
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         async with conn.transaction():
             existing = await conn.fetchrow("SELECT id, name, is_default FROM filaments WHERE id = $1", filament_id)
             if not existing:
@@ -898,13 +948,14 @@ async def delete_filament(filament_id: int):
                     """
                     SELECT id
                     FROM filaments
-                    ORDER BY CASE WHEN UPPER(material) = 'PLA' THEN 0 ELSE 1 END, name
+                    ORDER BY sort_rank, name
                     LIMIT 1
                     """
                 )
                 if replacement_id is not None:
                     await conn.execute("UPDATE filaments SET is_default = TRUE WHERE id = $1", replacement_id)
 
+    _invalidate_response_cache()
     return {"message": "Filament deleted"}
 
 
@@ -1035,6 +1086,32 @@ def _parse_filament_profile_payload(file_name: str, payload: dict) -> dict:
     }
 
 
+_PROFILE_MAX_BYTES = 1_048_576
+_UPLOAD_CHUNK_BYTES = 65_536
+
+
+async def _read_profile_json(file: UploadFile):
+    """Read an uploaded filament profile (capped at 1MB) and parse it as JSON."""
+    chunks = []
+    total = 0
+    while chunk := await file.read(_UPLOAD_CHUNK_BYTES):
+        total += len(chunk)
+        if total > _PROFILE_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Profile file too large (max 1MB)")
+        chunks.append(chunk)
+    raw = b"".join(chunks)
+
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        pass
+    # Lenient fallback for what orjson rejects (stray invalid UTF-8, NaN)
+    try:
+        return json.loads(raw.decode("utf-8", errors="ignore"))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid JSON profile file")
+
+
 @app.post("/filaments/import")
 async def import_filament_profile(file: UploadFile = File(...), rename_on_conflict: bool = Query(True)):
     """Import a filament profile from JSON and add to library."""
@@ -1044,11 +1121,7 @@ async def import_filament_profile(file: UploadFile = File(...), rename_on_confli
     if not file.filename.lower().endswith(".json"):
         raise HTTPException(status_code=400, detail="Only JSON filament profiles are supported for now")
 
-    try:
-        raw = await file.read()
-        payload = json.loads(raw.decode("utf-8", errors="ignore"))
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON profile file")
+    payload = await _read_profile_json(file)
 
     if not isinstance(payload, dict):
         raise HTTPException(status_code=400, detail="Profile JSON must be an object")
@@ -1056,10 +1129,8 @@ async def import_filament_profile(file: UploadFile = File(...), rename_on_confli
     parsed = _parse_filament_profile_payload(file.filename, payload)
     profile_name = parsed["name"]
 
-    from db import get_pg_pool
     pool = get_pg_pool()
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
 
         existing = await conn.fetchrow("SELECT id FROM filaments WHERE name = $1", profile_name)
         if existing and not rename_on_conflict:
@@ -1078,26 +1149,31 @@ async def import_filament_profile(file: UploadFile = File(...), rename_on_confli
 
         slicer_json = json.dumps(parsed["slicer_settings"]) if parsed["slicer_settings"] else None
 
-        row = await conn.fetchrow(
-            """
-            INSERT INTO filaments (
-                name, material, nozzle_temp, bed_temp, print_speed,
-                bed_type, color_hex, extruder_index, is_default, source_type, slicer_settings, density
+        try:
+            row = await conn.fetchrow(
+                """
+                INSERT INTO filaments (
+                    name, material, nozzle_temp, bed_temp, print_speed,
+                    bed_type, color_hex, extruder_index, is_default, source_type, slicer_settings, density
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, 0, FALSE, 'custom', $8, $9)
+                RETURNING id
+                """,
+                profile_name,
+                parsed["material"],
+                parsed["nozzle_temp"],
+                parsed["bed_temp"],
+                parsed["print_speed"],
+                parsed["bed_type"],
+                parsed["color_hex"],
+                slicer_json,
+                parsed["density"],
             )
-            VALUES ($1, $2, $3, $4, $5, $6, $7, 0, FALSE, 'custom', $8, $9)
-            RETURNING id
-            """,
-            profile_name,
-            parsed["material"],
-            parsed["nozzle_temp"],
-            parsed["bed_temp"],
-            parsed["print_speed"],
-            parsed["bed_type"],
-            parsed["color_hex"],
-            slicer_json,
-            parsed["density"],
-        )
+        except UniqueViolationError:
+            # Name taken by a concurrent insert since the lookup above
+            raise HTTPException(status_code=409, detail="A filament with this profile name already exists")
 
+    _invalidate_response_cache()
     return {
         "id": row["id"],
         "message": "Filament profile imported",
@@ -1116,21 +1192,15 @@ async def preview_filament_profile_import(file: UploadFile = File(...)):
     if not file.filename.lower().endswith(".json"):
         raise HTTPException(status_code=400, detail="Only JSON filament profiles are supported for now")
 
-    try:
-        raw = await file.read()
-        payload = json.loads(raw.decode("utf-8", errors="ignore"))
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON profile file")
+    payload = await _read_profile_json(file)
 
     if not isinstance(payload, dict):
         raise HTTPException(status_code=400, detail="Profile JSON must be an object")
 
     parsed = _parse_filament_profile_payload(file.filename, payload)
 
-    from db import get_pg_pool
     pool = get_pg_pool()
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         existing = await conn.fetchrow("SELECT id, name FROM filaments WHERE name = $1", parsed["name"])
 
     return {
@@ -1155,11 +1225,9 @@ async def preview_filament_profile_import(file: UploadFile = File(...)):
 @app.get("/filaments/{filament_id}/export")
 async def export_filament_profile(filament_id: int):
     """Export a filament profile as OrcaSlicer-compatible JSON."""
-    from db import get_pg_pool
     pool = get_pg_pool()
 
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         row = await conn.fetchrow(
             "SELECT name, material, nozzle_temp, bed_temp, print_speed, bed_type, color_hex, slicer_settings, density FROM filaments WHERE id = $1",
             filament_id,
@@ -1189,7 +1257,6 @@ async def export_filament_profile(filament_id: int):
         except Exception:
             pass
 
-    from fastapi.responses import Response
     return Response(
         content=json.dumps(profile, indent=2),
         media_type="application/json",
@@ -1202,35 +1269,15 @@ async def export_filament_profile(filament_id: int):
 @app.post("/filaments/init-defaults")
 async def init_default_filaments():
     """Initialize default filament profiles."""
-    from db import get_pg_pool
     pool = get_pg_pool()
 
-    default_filaments = [
-        {"name": "PLA Red", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#FF0000", "extruder_index": 0, "is_default": True, "source_type": "starter"},
-        {"name": "PLA Blue", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#0000FF", "extruder_index": 1, "is_default": False, "source_type": "starter"},
-        {"name": "PLA Green", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#00FF00", "extruder_index": 2, "is_default": False, "source_type": "starter"},
-        {"name": "PLA Yellow", "material": "PLA", "nozzle_temp": 210, "bed_temp": 60, "print_speed": 200, "bed_type": "PEI", "color_hex": "#FFFF00", "extruder_index": 3, "is_default": False, "source_type": "starter"},
-        {"name": "PETG", "material": "PETG", "nozzle_temp": 240, "bed_temp": 80, "print_speed": 150, "bed_type": "PEI", "color_hex": "#FF6600", "extruder_index": 0, "is_default": False, "source_type": "starter"},
-        {"name": "ABS", "material": "ABS", "nozzle_temp": 250, "bed_temp": 100, "print_speed": 150, "bed_type": "Glass", "color_hex": "#333333", "extruder_index": 0, "is_default": False, "source_type": "starter"},
-        {"name": "TPU", "material": "TPU", "nozzle_temp": 220, "bed_temp": 40, "print_speed": 30, "bed_type": "PEI", "color_hex": "#FF00FF", "extruder_index": 0, "is_default": False, "source_type": "starter"},
-    ]
-
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
-        for f in default_filaments:
-            try:
-                await conn.execute(
-                    """
-                    INSERT INTO filaments (name, material, nozzle_temp, bed_temp, print_speed, bed_type, color_hex, extruder_index, is_default, source_type)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                    ON CONFLICT (name) DO NOTHING
-                    """,
-                    f["name"], f["material"], f["nozzle_temp"], f["bed_temp"],
-                    f["print_speed"], f["bed_type"], f["color_hex"], f["extruder_index"], f["is_default"], f["source_type"]
-                )
-            except Exception as e:
-                pass
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
+        try:
+            await _insert_starter_filaments(conn)
+        except Exception:
+            pass
 
+        _invalidate_response_cache()
         return {"message": "Default filaments initialized"}
 
 
@@ -1242,8 +1289,7 @@ async def init_default_filaments():
 async def export_settings():
     """Export all settings as a downloadable JSON file."""
     pool = get_pg_pool()
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
 
         # Printer settings
         printer_row = await conn.fetchrow("SELECT moonraker_url, makerworld_enabled FROM printer_settings WHERE id = 1")
@@ -1339,24 +1385,52 @@ async def import_settings(file: UploadFile = File(...)):
         raise HTTPException(400, "Unsupported backup format or version")
 
     settings = data.get("settings", {})
-    pool = get_pg_pool()
 
-    filaments_imported = 0
-    async with pool.acquire() as conn:
-        await _ensure_filament_schema(conn)
+    # Build every statement argument before taking a connection, so it is only
+    # held for the SQL itself.
+    filament_args = []
+    for f in settings.get("filaments", []):
+        name = f.get("name")
+        if not name:
+            continue
+        slicer_settings = f.get("slicer_settings")
+        if slicer_settings and isinstance(slicer_settings, dict):
+            slicer_settings = json.dumps(slicer_settings)
+        elif slicer_settings and not isinstance(slicer_settings, str):
+            slicer_settings = None
+        filament_args.append((
+            name,
+            f.get("material", "PLA"),
+            f.get("nozzle_temp", 200),
+            f.get("bed_temp", 60),
+            f.get("print_speed", 200),
+            f.get("bed_type", "PEI"),
+            f.get("color_hex", "#FFFFFF"),
+            f.get("is_default", False),
+            f.get("source_type", "manual"),
+            f.get("density", 1.24),
+            slicer_settings,
+        ))
+
+    preset_args = [
+        (ep["slot"], ep.get("filament_name") or None, ep.get("color_hex", "#FFFFFF"))
+        for ep in settings.get("extruder_presets", [])
+        if ep.get("slot") and 1 <= ep["slot"] <= 4
+    ]
+
+    sd = settings.get("slicing_defaults", {})
+    setting_modes = sd.get("setting_modes") if sd else None
+    if isinstance(setting_modes, dict):
+        setting_modes = json.dumps(setting_modes)
+    elif not isinstance(setting_modes, str):
+        setting_modes = None
+
+    pool = get_pg_pool()
+    async with pool.acquire(timeout=ACQUIRE_TIMEOUT) as conn:
         async with conn.transaction():
             # 1. Import filaments (upsert by name)
-            for f in settings.get("filaments", []):
-                name = f.get("name")
-                if not name:
-                    continue
-                slicer_settings = f.get("slicer_settings")
-                if slicer_settings and isinstance(slicer_settings, dict):
-                    slicer_settings = json.dumps(slicer_settings)
-                elif slicer_settings and not isinstance(slicer_settings, str):
-                    slicer_settings = None
-
-                await conn.execute(
+            if filament_args:
+                await conn.executemany(
                     """
                     INSERT INTO filaments (name, material, nozzle_temp, bed_temp, print_speed,
                         bed_type, color_hex, is_default, source_type, density, slicer_settings)
@@ -1373,52 +1447,24 @@ async def import_settings(file: UploadFile = File(...)):
                         density = EXCLUDED.density,
                         slicer_settings = EXCLUDED.slicer_settings
                     """,
-                    name,
-                    f.get("material", "PLA"),
-                    f.get("nozzle_temp", 200),
-                    f.get("bed_temp", 60),
-                    f.get("print_speed", 200),
-                    f.get("bed_type", "PEI"),
-                    f.get("color_hex", "#FFFFFF"),
-                    f.get("is_default", False),
-                    f.get("source_type", "manual"),
-                    f.get("density", 1.24),
-                    slicer_settings,
+                    filament_args,
                 )
-                filaments_imported += 1
 
             # 2. Import extruder presets (resolve filament_name → filament_id)
-            for ep in settings.get("extruder_presets", []):
-                slot = ep.get("slot")
-                if not slot or slot < 1 or slot > 4:
-                    continue
-                filament_id = None
-                if ep.get("filament_name"):
-                    row = await conn.fetchrow(
-                        "SELECT id FROM filaments WHERE name = $1", ep["filament_name"]
-                    )
-                    if row:
-                        filament_id = row["id"]
-                await conn.execute(
+            if preset_args:
+                await conn.executemany(
                     """
                     INSERT INTO extruder_presets (slot, filament_id, color_hex)
-                    VALUES ($1, $2, $3)
+                    VALUES ($1, (SELECT id FROM filaments WHERE name = $2), $3)
                     ON CONFLICT (slot) DO UPDATE SET
                         filament_id = EXCLUDED.filament_id,
                         color_hex = EXCLUDED.color_hex
                     """,
-                    slot, filament_id, ep.get("color_hex", "#FFFFFF"),
+                    preset_args,
                 )
 
             # 3. Import slicing defaults
-            sd = settings.get("slicing_defaults", {})
             if sd:
-                setting_modes = sd.get("setting_modes")
-                if isinstance(setting_modes, dict):
-                    setting_modes = json.dumps(setting_modes)
-                elif not isinstance(setting_modes, str):
-                    setting_modes = None
-
                 await conn.execute(
                     """
                     UPDATE slicing_defaults SET
@@ -1490,4 +1536,5 @@ async def import_settings(file: UploadFile = File(...)):
                     printer.get("makerworld_enabled"),
                 )
 
-    return {"success": True, "filaments_imported": filaments_imported}
+    _invalidate_response_cache()
+    return {"success": True, "filaments_imported": len(filament_args)}
@@ -1,28 +1,277 @@
+import asyncio
+import functools
+import logging
 import os
 import re
-from pathlib import Path
-from typing import Optional, Dict, Any
+import time
+import uuid
+from types import MappingProxyType
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, BinaryIO, Callable, Mapping
 from urllib.parse import urljoin, urlparse, urlunparse
 import httpx
+import orjson
+import websockets
+
+logger = logging.getLogger(__name__)
+
+# Optional follow-up for print actions, run after the HTTP response is back.
+OnComplete = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+FILAMENT_PROBE_TIMEOUT = 2.0
+SUBSCRIPTION_RETRY_DELAY = 5.0
+# Consecutive subscription failures back off exponentially up to this delay
+SUBSCRIPTION_MAX_RETRY_DELAY = 300.0
+# Safety cap: AFC systems typically have 4-12 lanes max
+AFC_SLOT_CAP = 12
+# Lanes sit a few levels below each AFC object; deeper nesting is telemetry
+AFC_MAX_DEPTH = 6
+_CONTAINER_TYPES = (dict, list)
+# How long the AFC object listing is trusted before /printer/objects/list is re-read
+AFC_OBJECTS_TTL = 60.0
+# /server/info is near-static; health checks within this window reuse it
+SERVER_INFO_TTL = 5.0
+HEALTH_FAILURE_TTL = 2.0
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_MATERIAL_RE = re.compile(r"[A-Z0-9_+\-]+")
+_NAME_SPLIT_RE = re.compile(r"[\s_\-]+")
+_PLAIN_MATERIAL_RE = re.compile(r"(?i)(pla|petg|abs|asa|tpu|pc|pa|pva)")
+_IDENT_RE = re.compile(r"[A-Za-z][A-Za-z0-9+._]*")
+_MANUFACTURER_KEY_RE = re.compile(r"manufacturer|brand|vendor|maker|mfr|supplier")
+_MANUFACTURER_KEY_CACHE: dict[Any, bool] = {}
+
+_MATERIAL_ALIASES = MappingProxyType({
+    "PLA+": "PLA", "PLAPLUS": "PLA", "PET-G": "PETG",
+    "ABS+": "ABS", "NYLON": "PA", "PA6": "PA", "PA12": "PA",
+})
+_KNOWN_MATERIALS = frozenset({"PLA", "PETG", "ABS", "ASA", "TPU", "PC", "PA", "PVA", "HIPS"})
+# (lowercase token, canonical name), checked in order
+_KNOWN_MANUFACTURERS = (
+    ("bambu", "Bambu"), ("sunlu", "Sunlu"), ("esun", "eSUN"),
+    ("polymaker", "Polymaker"), ("prusament", "Prusament"), ("snapmaker", "Snapmaker"),
+)
+
+_COLOR_KEYS = (
+    "color", "colour", "color_hex", "colour_hex", "hex",
+    "spool_color", "filament_color", "loaded_color",
+)
+_LOADED_KEYS = ("loaded", "is_loaded", "filament_present", "has_filament", "load", "prep")
+_TOOL_LOADED_KEYS = ("tool_loaded", "loaded_to_tool", "loaded_to_nozzle", "nozzle_loaded")
+_MATERIAL_KEYS = (
+    "material", "material_type", "filament_material",
+    "filament_type", "spool_material", "mat",
+)
+_MANUFACTURER_KEYS = (
+    "manufacturer", "brand", "vendor", "vendor_name", "maker",
+    "filament_brand", "material_brand", "spool_brand", "mfr", "supplier",
+)
+_LANE_KEYS = frozenset(("loaded", "tool_loaded", "lane", "slot", "index", "name"))
+
+# Set views of the ordered key tuples above, so extractors can bail out with a
+# single C-level check on nodes that carry none of the keys.  The tuples keep
+# the lookup priority.
+_COLOR_KEY_SET = frozenset(_COLOR_KEYS)
+_LOADED_KEY_SET = frozenset(_LOADED_KEYS)
+_TOOL_LOADED_KEY_SET = frozenset(_TOOL_LOADED_KEYS)
+_MATERIAL_KEY_SET = frozenset(_MATERIAL_KEYS)
+_MANUFACTURER_KEY_SET = frozenset(_MANUFACTURER_KEYS)
+
+# Klipper objects (and the fields of each) read by query_print_status.
+# Asking only for these keeps query responses small and stops the status
+# subscription from pushing e.g. toolhead position on every move.
+_TEMPS = ("temperature", "target")
+STATUS_FIELDS = MappingProxyType({
+    "print_stats": ("state", "filename", "print_duration", "filament_used"),
+    "virtual_sdcard": ("progress",),
+    "toolhead": ("extruder",),
+    "extruder": _TEMPS,
+    "extruder1": _TEMPS,
+    "extruder2": _TEMPS,
+    "extruder3": _TEMPS,
+    "heater_bed": _TEMPS,
+})
+STATUS_OBJECTS = tuple(STATUS_FIELDS)
+EXTRUDER_OBJECTS = ("extruder", "extruder1", "extruder2", "extruder3")
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+# Read-only query params shared across polls (no per-call dict allocation)
+_ALL_STATUS_PARAMS = MappingProxyType({name: ",".join(fields) for name, fields in STATUS_FIELDS.items()})
+_FILAMENT_CONFIG_PARAMS = MappingProxyType({"print_task_config": "", "filament_detect": ""})
+
+# Keep a few warm connections to the printer so status polling does not pay
+# for a fresh TCP connect on every request.
+CLIENT_LIMITS = httpx.Limits(
+    max_connections=16,
+    max_keepalive_connections=8,
+    keepalive_expiry=60.0,
+)
+# Fail fast when the printer is off instead of stalling for the full timeout
+CLIENT_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+UPLOAD_LIMITS = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+
+
+def _multipart_upload(f: BinaryIO, filename: str, file_size: int, fields: Dict[str, str]) -> tuple[str, int, AsyncIterator[bytes]]:
+    """Build a streamed multipart/form-data body for a single file upload.
+
+    Returns (content_type, content_length, body).  The open file is read in
+    fixed-size blocks off the event loop, so memory stays bounded and the
+    loop is never blocked on disk I/O regardless of the G-code size."""
+    boundary = uuid.uuid4().hex
+    safe_name = filename.replace("\\", "\\\\").replace('"', "%22")
+
+    head = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    )
+    head += (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{safe_name}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        while True:
+            chunk = await asyncio.to_thread(f.read, UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+        yield tail
+
+    content_type = f"multipart/form-data; boundary={boundary}"
+    return content_type, len(head) + file_size + len(tail), body()
+
+
+def _json(response: httpx.Response) -> Any:
+    """Decode a Moonraker response body with orjson."""
+    return orjson.loads(response.content)
+
+
+async def _raise_for_status(response: httpx.Response):
+    """Response hook: every Moonraker error status raises HTTPStatusError.
+
+    Redirects pass through (the client follows them)."""
+    if response.is_error:
+        response.raise_for_status()
+
+
+_EVENT_HOOKS = {"response": [_raise_for_status]}
+
+
+def _log_background_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Moonraker on_complete hook failed: %s", task.exception())
+
+
+def _require_client(method):
+    """Raise RuntimeError when a client method is called before connect()."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if self.client is None:
+            raise RuntimeError("Client not connected. Call connect() first.")
+        return await method(self, *args, **kwargs)
+    return wrapper
+
+
+def _is_manufacturer_key(key: Any) -> bool:
+    """Whether a node key looks like a manufacturer field (memoised per key)."""
+    hit = _MANUFACTURER_KEY_CACHE.get(key)
+    if hit is None:
+        hit = _MANUFACTURER_KEY_RE.search(str(key).lower()) is not None
+        # AFC key names come from a small vocabulary; the bound only guards
+        # against printers that put ids or timestamps in key names
+        if len(_MANUFACTURER_KEY_CACHE) < 1024:
+            _MANUFACTURER_KEY_CACHE[key] = hit
+    return hit
+
+
+def _join_path(link: Any) -> str:
+    """Render a (parent, key, is_index) link chain as 'obj.key[0].key'."""
+    parts = []
+    while isinstance(link, tuple):
+        link, key, is_index = link
+        parts.append(f"[{key}]" if is_index else f".{key}")
+    return link + "".join(reversed(parts))
 
 
 class MoonrakerClient:
     """Moonraker API client for printer communication."""
 
+    # Fixed attribute set: cheaper attribute access on the polling path
+    __slots__ = (
+        "base_url", "client", "_upload_client", "_upload_sem",
+        "_status_cache", "_status_version", "_status_memo", "_status_params",
+        "_subscription", "_server_info_cache", "_health_failed_at",
+        "_afc_objects", "_afc_objects_ts", "_afc_params",
+        "_background", "_inflight", "_base_keep_port", "_base_no_port",
+    )
+
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip("/")
         self.client: Optional[httpx.AsyncClient] = None
+        self._upload_client: Optional[httpx.AsyncClient] = None
+        self._upload_sem = asyncio.Semaphore(1)
+        # Live copy of STATUS_OBJECTS kept up to date over the websocket;
+        # None whenever the subscription is down.
+        self._status_cache: Optional[Dict[str, Any]] = None
+        # Bumped on every push update; the built status is reused until then
+        self._status_version = 0
+        self._status_memo: Optional[tuple[int, Dict[str, Any]]] = None
+        # STATUS_OBJECTS narrowed to what /printer/objects/list reports
+        self._status_params: Optional[Mapping[str, str]] = None
+        self._server_info_cache: Optional[tuple[float, Dict[str, Any]]] = None
+        self._health_failed_at = float("-inf")
+        # AFC object names from the last object listing (None = not listed yet)
+        self._afc_objects: Optional[list[str]] = None
+        self._afc_objects_ts = 0.0
+        self._afc_params: Mapping[str, str] = _EMPTY
+        self._subscription: Optional[asyncio.Task] = None
+        # Strong refs to fire-and-forget on_complete tasks until they finish
+        self._background: set[asyncio.Task] = set()
+        self._inflight: Dict[Any, asyncio.Task] = {}
 
     async def connect(self):
         """Initialize HTTP client."""
+        # Limits must live on the transport once one is passed explicitly;
+        # retries=1 only covers connect errors (e.g. a stale keepalive socket).
         self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=CLIENT_TIMEOUT,
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(retries=1, limits=CLIENT_LIMITS),
+            event_hooks=_EVENT_HOOKS,
+        )
+        # Uploads get their own single connection so a long G-code POST never
+        # holds a pooled connection that status polls are waiting on.
+        self._upload_client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=10.0,
-            follow_redirects=True
+            follow_redirects=True,
+            limits=UPLOAD_LIMITS,
+            event_hooks=_EVENT_HOOKS,
         )
+        # Webcam URL resolution joins against these for every camera
+        self._base_keep_port = self._build_base_url(keep_port=True)
+        self._base_no_port = self._build_base_url(keep_port=False)
 
     async def close(self):
         """Close HTTP client."""
+        if self._subscription:
+            self._subscription.cancel()
+            try:
+                await self._subscription
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._subscription = None
+        self._status_cache = None
+        self._status_params = None
+        self._server_info_cache = None
+        self._health_failed_at = float("-inf")
+        self._afc_objects = None
+        if self._upload_client:
+            await self._upload_client.aclose()
+            self._upload_client = None
         if self.client:
             await self.client.aclose()
             self.client = None
@@ -33,154 +282,290 @@ class MoonrakerClient:
         self.base_url = new_url.rstrip("/")
         await self.connect()
 
+    def _fire(self, coro: Awaitable[Any]):
+        """Run a side effect in the background, off the caller's response path."""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        task.add_done_callback(_log_background_failure)
+
+    def _finish(self, response: httpx.Response, on_complete: Optional[OnComplete]) -> Dict[str, Any]:
+        result = _json(response)
+        if on_complete is not None:
+            self._fire(on_complete(result))
+        return result
+
+    async def _single_flight(self, key: Any, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory() once for all concurrent callers with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Task):
+                if self._inflight.get(key) is t:
+                    del self._inflight[key]
+                # Mark the exception retrieved even if every caller was cancelled
+                if not t.cancelled():
+                    t.exception()
+
+            task.add_done_callback(_done)
+        # Shield so one caller going away does not cancel the shared query
+        return await asyncio.shield(task)
+
+    def _websocket_url(self) -> str:
+        parsed = urlparse(self.base_url)
+        scheme = "wss" if parsed.scheme == "https" else "ws"
+        return urlunparse((scheme, parsed.netloc, parsed.path.rstrip("/") + "/websocket", "", "", ""))
+
+    def _ensure_subscription(self):
+        """Start the status subscription task if it is not already running."""
+        if self._subscription is None or self._subscription.done():
+            self._subscription = asyncio.create_task(self._run_subscription())
+
+    async def _run_subscription(self):
+        """Mirror STATUS_OBJECTS into _status_cache from Moonraker push updates.
+
+        Reconnects after SUBSCRIPTION_RETRY_DELAY whenever the socket drops or
+        Klippy goes away; callers fall back to HTTP while the cache is None.
+        Consecutive failures double the delay up to SUBSCRIPTION_MAX_RETRY_DELAY
+        and are logged at warning level only on the first one."""
+        failures = 0
+        while True:
+            error: Optional[str] = None
+            try:
+                async with websockets.connect(self._websocket_url(), max_size=None) as ws:
+                    await ws.send(orjson.dumps({
+                        "jsonrpc": "2.0",
+                        "method": "printer.objects.subscribe",
+                        "params": {"objects": {name: list(fields) for name, fields in STATUS_FIELDS.items()}},
+                        "id": 1,
+                    }))
+                    async for raw in ws:
+                        message = orjson.loads(raw)
+                        method = message.get("method")
+                        if message.get("id") == 1:
+                            if "error" in message:
+                                error = f"subscribe rejected: {message['error']}"
+                                break
+                            self._status_cache = message["result"]["status"]
+                            self._status_version += 1
+                            if failures:
+                                logger.info("Moonraker status subscription restored")
+                            failures = 0
+                        elif method == "notify_status_update" and self._status_cache is not None:
+                            for name, fields in message["params"][0].items():
+                                self._status_cache.setdefault(name, {}).update(fields)
+                            self._status_version += 1
+                        elif method in ("notify_klippy_disconnected", "notify_klippy_shutdown"):
+                            break
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            self._status_cache = None
+
+            delay = SUBSCRIPTION_RETRY_DELAY
+            if error is not None:
+                failures += 1
+                delay = min(SUBSCRIPTION_RETRY_DELAY * 2 ** (failures - 1), SUBSCRIPTION_MAX_RETRY_DELAY)
+                log = logger.warning if failures == 1 else logger.debug
+                log(
+                    "Moonraker status subscription failed (%s); polling over HTTP, retrying in %.0fs",
+                    error, delay,
+                )
+            await asyncio.sleep(delay)
+
+    def _set_available_objects(self, objects: list[str]):
+        objects = set(objects)
+        available = MappingProxyType({
+            name: query for name, query in _ALL_STATUS_PARAMS.items() if name in objects
+        })
+        # An empty list means Klippy is not ready yet; keep asking next time
+        self._status_params = available or None
+
+    async def _status_query_params(self) -> Mapping[str, str]:
+        """Status query params limited to objects this printer actually has."""
+        if self._status_params is None:
+            try:
+                response = await self.client.get("/printer/objects/list")
+                self._set_available_objects(_json(response).get("result", _EMPTY).get("objects", []))
+            except httpx.HTTPError:
+                pass
+        return self._status_params or _ALL_STATUS_PARAMS
+
+    @_require_client
     async def get_printer_info(self) -> Dict[str, Any]:
         """Get printer information and status."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
-
         response = await self.client.get("/printer/info")
-        response.raise_for_status()
-        return response.json()
+        return _json(response)
 
+    @_require_client
     async def get_server_info(self) -> Dict[str, Any]:
-        """Get Moonraker server information."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
-
+        """Get Moonraker server information (cached for SERVER_INFO_TTL)."""
+        cached = self._server_info_cache
+        if cached is not None and time.monotonic() - cached[0] < SERVER_INFO_TTL:
+            return cached[1]
         response = await self.client.get("/server/info")
-        response.raise_for_status()
-        return response.json()
+        info = _json(response)
+        self._server_info_cache = (time.monotonic(), info)
+        return info
 
     async def health_check(self) -> bool:
-        """Check if Moonraker is reachable."""
+        """Check if Moonraker is reachable.
+
+        Successes ride on the get_server_info cache; failures are remembered
+        for HEALTH_FAILURE_TTL so an offline printer is not re-probed (and
+        waited on) by every caller."""
+        if time.monotonic() - self._health_failed_at < HEALTH_FAILURE_TTL:
+            return False
         try:
             await self.get_server_info()
             return True
         except Exception:
+            self._health_failed_at = time.monotonic()
             return False
 
-    async def upload_gcode(self, gcode_path: str, filename: str) -> Dict[str, Any]:
-        """Upload a G-code file to Moonraker's virtual SD card."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
+    @_require_client
+    async def upload_gcode(
+        self, gcode_path: str, filename: str, on_complete: Optional[OnComplete] = None
+    ) -> Dict[str, Any]:
+        """Upload a G-code file to Moonraker's virtual SD card.
+
+        on_complete (also accepted by the print actions below) is scheduled as
+        a background task with the decoded response, so caller bookkeeping
+        does not delay the return."""
+        # One open + fstat instead of exists/stat/open; unbuffered so blocks go
+        # straight from the kernel into the request body.
+        try:
+            f = open(gcode_path, "rb", buffering=0)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"G-code file not found: {gcode_path}") from None
+
+        with f:
+            file_size = os.fstat(f.fileno()).st_size
+            # Dynamic timeout: min 30s, ~1s per MB, max 300s
+            upload_timeout = min(300.0, max(30.0, file_size / (1024 * 1024)))
 
-        path = Path(gcode_path)
-        if not path.exists():
-            raise FileNotFoundError(f"G-code file not found: {gcode_path}")
-
-        file_size = path.stat().st_size
-        # Dynamic timeout: min 30s, ~1s per MB, max 300s
-        upload_timeout = min(300.0, max(30.0, file_size / (1024 * 1024)))
-
-        with open(path, "rb") as f:
-            files = {"file": (filename, f, "application/octet-stream")}
-            data = {"root": "gcodes"}
-            response = await self.client.post(
-                "/server/files/upload",
-                files=files,
-                data=data,
-                timeout=upload_timeout,
+            content_type, content_length, body = _multipart_upload(
+                f, filename, file_size, {"root": "gcodes"}
             )
-        response.raise_for_status()
-        return response.json()
+            async with self._upload_sem:
+                response = await self._upload_client.post(
+                    "/server/files/upload",
+                    content=body,
+                    headers={"Content-Type": content_type, "Content-Length": str(content_length)},
+                    timeout=upload_timeout,
+                )
+        return self._finish(response, on_complete)
 
-    async def start_print(self, filename: str) -> Dict[str, Any]:
+    @_require_client
+    async def start_print(self, filename: str, on_complete: Optional[OnComplete] = None) -> Dict[str, Any]:
         """Start printing a file already uploaded to the printer."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
-
         response = await self.client.post(
             "/printer/print/start",
             params={"filename": filename},
         )
-        response.raise_for_status()
-        return response.json()
+        return self._finish(response, on_complete)
 
-    async def pause_print(self) -> Dict[str, Any]:
+    @_require_client
+    async def pause_print(self, on_complete: Optional[OnComplete] = None) -> Dict[str, Any]:
         """Pause the current print."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
         response = await self.client.post("/printer/print/pause")
-        response.raise_for_status()
-        return response.json()
+        return self._finish(response, on_complete)
 
-    async def resume_print(self) -> Dict[str, Any]:
+    @_require_client
+    async def resume_print(self, on_complete: Optional[OnComplete] = None) -> Dict[str, Any]:
         """Resume a paused print."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
         response = await self.client.post("/printer/print/resume")
-        response.raise_for_status()
-        return response.json()
+        return self._finish(response, on_complete)
 
-    async def cancel_print(self) -> Dict[str, Any]:
+    @_require_client
+    async def cancel_print(self, on_complete: Optional[OnComplete] = None) -> Dict[str, Any]:
         """Cancel the current print."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
         response = await self.client.post("/printer/print/cancel")
-        response.raise_for_status()
-        return response.json()
+        return self._finish(response, on_complete)
 
+    @_require_client
     async def query_print_status(self, include_filament_config: bool = False) -> Dict[str, Any]:
-        """Query printer objects for print status, progress, and temperatures."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
+        """Query printer objects for print status, progress, and temperatures.
+
+        Concurrent callers share one in-flight query, and unchanged ticks
+        reuse the memoised status, so each caller gets its own shallow copy;
+        nested values (e.g. ``extruders``) are shared and must not be mutated."""
+        status = await self._single_flight(
+            ("status", include_filament_config),
+            lambda: self._query_print_status(include_filament_config),
+        )
+        return dict(status)
 
-        response = await self.client.get(
-            "/printer/objects/query",
-            params={
-                "print_stats": "",
-                "virtual_sdcard": "",
-                "toolhead": "",
-                "extruder": "",
-                "extruder1": "",
-                "extruder2": "",
-                "extruder3": "",
-                "heater_bed": "",
-            },
+    async def _query_print_status(self, include_filament_config: bool) -> Dict[str, Any]:
+        self._ensure_subscription()
+        data = self._status_cache
+        if data is None:
+            params = await self._status_query_params()
+            try:
+                response = await self.client.get("/printer/objects/query", params=params)
+            except httpx.HTTPStatusError:
+                # Object set may have changed (e.g. Klipper config reload)
+                self._status_params = None
+                raise
+            status = self._build_print_status(_json(response).get("result", _EMPTY).get("status", _EMPTY))
+        else:
+            # Rebuild only when a push update arrived since the last poll
+            memo = self._status_memo
+            if memo is not None and memo[0] == self._status_version:
+                status = memo[1]
+            else:
+                status = self._build_print_status(data)
+                self._status_memo = (self._status_version, status)
+
+        if not include_filament_config:
+            return status
+
+        # Probe print_task_config (all U1 printers) and AFC (custom
+        # firmware) concurrently; prefer print_task_config when it reports.
+        has_filament_config = False
+        filament_slots = []
+        ptc, afc = await asyncio.gather(
+            asyncio.wait_for(self.query_filament_config(), FILAMENT_PROBE_TIMEOUT),
+            asyncio.wait_for(self.query_afc_slots(), FILAMENT_PROBE_TIMEOUT),
+            return_exceptions=True,
         )
-        response.raise_for_status()
-        data = response.json().get("result", {}).get("status", {})
+        if not isinstance(ptc, BaseException):
+            has_filament_config, filament_slots = ptc
+        if not has_filament_config and not isinstance(afc, BaseException) and afc[0]:
+            has_filament_config, filament_slots = afc
 
-        print_stats = data.get("print_stats", {})
-        virtual_sdcard = data.get("virtual_sdcard", {})
-        heater_bed = data.get("heater_bed", {})
+        return {
+            **status,
+            "has_filament_config": has_filament_config,
+            "filament_slots": filament_slots,
+            # Deprecated aliases (kept for one release cycle)
+            "has_afc": has_filament_config,
+            "afc_slots": filament_slots,
+        }
+
+    @staticmethod
+    def _build_print_status(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape raw STATUS_OBJECTS data into the print status response."""
+        print_stats = data.get("print_stats", _EMPTY)
+        virtual_sdcard = data.get("virtual_sdcard", _EMPTY)
+        heater_bed = data.get("heater_bed", _EMPTY)
 
         # Active extruder from toolhead
-        active_extruder_name = data.get("toolhead", {}).get("extruder", "extruder")
+        active_extruder_name = data.get("toolhead", _EMPTY).get("extruder", "extruder")
 
         # All 4 extruder temperatures
-        extruders = []
-        for name in ["extruder", "extruder1", "extruder2", "extruder3"]:
-            ext = data.get(name, {})
-            if ext:
-                extruders.append({
-                    "temp": ext.get("temperature", 0.0),
-                    "target": ext.get("target", 0.0),
-                    "active": name == active_extruder_name,
-                })
-            else:
-                extruders.append({"temp": 0.0, "target": 0.0, "active": False})
-
-        active_extruder = data.get(active_extruder_name, data.get("extruder", {}))
+        extruders = [
+            {
+                "temp": ext.get("temperature", 0.0),
+                "target": ext.get("target", 0.0),
+                "active": bool(ext) and name == active_extruder_name,
+            }
+            for name in EXTRUDER_OBJECTS
+            for ext in (data.get(name) or _EMPTY,)
+        ]
 
-        has_filament_config = False
-        filament_slots = []
-        if include_filament_config:
-            # Try standard print_task_config first (works on all U1 printers)
-            try:
-                has_filament_config, filament_slots = await self.query_filament_config()
-            except Exception:
-                has_filament_config, filament_slots = False, []
-
-            # Fall back to AFC for custom firmware users
-            if not has_filament_config:
-                try:
-                    has_afc, afc_slots = await self.query_afc_slots()
-                    if has_afc:
-                        has_filament_config = True
-                        filament_slots = afc_slots
-                except Exception:
-                    pass
+        active_extruder = data.get(active_extruder_name, data.get("extruder", _EMPTY))
 
         return {
             "state": print_stats.get("state", "standby"),
@@ -193,46 +578,94 @@ class MoonrakerClient:
             "bed_temp": heater_bed.get("temperature", 0.0),
             "bed_target": heater_bed.get("target", 0.0),
             "extruders": extruders,
-            "has_filament_config": has_filament_config,
-            "filament_slots": filament_slots,
+            "has_filament_config": False,
+            "filament_slots": [],
             # Deprecated aliases (kept for one release cycle)
-            "has_afc": has_filament_config,
-            "afc_slots": filament_slots,
+            "has_afc": False,
+            "afc_slots": [],
         }
 
+    @_require_client
     async def query_afc_slots(self) -> tuple[bool, list[dict[str, Any]]]:
         """Discover AFC-related Moonraker objects and extract loaded color info.
 
         Returns (has_afc, slots) — has_afc is True when AFC Klipper objects
         exist on the printer, even if no slots are currently loaded."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
-
-        list_response = await self.client.get("/printer/objects/list")
-        list_response.raise_for_status()
-        objects = list_response.json().get("result", {}).get("objects", [])
-
-        afc_objects = [name for name in objects if "afc" in str(name).lower()]
-        if not afc_objects:
-            return False, []
-
-        query_params = {name: "" for name in afc_objects}
-        query_response = await self.client.get("/printer/objects/query", params=query_params)
-        query_response.raise_for_status()
-        status = query_response.json().get("result", {}).get("status", {})
+        return await self._single_flight("afc", self._query_afc_slots)
+
+    async def _query_afc_slots(self) -> tuple[bool, list[dict[str, Any]]]:
+        known = self._afc_objects
+        if known is not None and time.monotonic() - self._afc_objects_ts < AFC_OBJECTS_TTL:
+            # Object set is still fresh: skip the listing entirely (and, on
+            # printers without AFC, the whole round trip).
+            afc_objects = known
+            if not afc_objects:
+                return False, []
+            try:
+                query_response = await self.client.get(
+                    "/printer/objects/query", params=self._afc_params
+                )
+            except httpx.HTTPStatusError:
+                self._afc_objects = None
+                raise
+        else:
+            # Speculatively query the AFC objects seen last time alongside the
+            # object list, saving a round trip whenever the set is unchanged.
+            speculative: Any = None
+            if known:
+                list_response, speculative = await asyncio.gather(
+                    self.client.get("/printer/objects/list"),
+                    self.client.get("/printer/objects/query", params=self._afc_params),
+                    return_exceptions=True,
+                )
+                if isinstance(list_response, BaseException):
+                    raise list_response
+            else:
+                list_response = await self.client.get("/printer/objects/list")
+            objects = _json(list_response).get("result", _EMPTY).get("objects", [])
+            self._set_available_objects(objects)
+
+            afc_objects = [name for name in objects if "afc" in name.lower()]
+            if afc_objects != known:
+                self._afc_params = MappingProxyType({name: "" for name in afc_objects})
+            self._afc_objects = afc_objects
+            self._afc_objects_ts = time.monotonic()
+            if not afc_objects:
+                return False, []
+
+            if afc_objects == known and isinstance(speculative, httpx.Response):
+                query_response = speculative
+            else:
+                query_response = await self.client.get("/printer/objects/query", params=self._afc_params)
+        status = _json(query_response).get("result", _EMPTY).get("status", _EMPTY)
 
         slots: list[dict[str, Any]] = []
         seen: set[tuple[str, str, Optional[str], Optional[str], Optional[bool], Optional[bool]]] = set()
 
-        def _walk(path: str, node: Any):
-            if isinstance(node, dict):
-                color = self._extract_hex_color(node)
+        # Iterative pre-order walk (same visiting order as a recursive one).
+        # Paths are kept as (parent, key, is_index) links and only joined into
+        # a string for nodes that actually become slots.
+        stack: list[tuple[Any, Any, int]] = [
+            (status.get(object_name, _EMPTY), object_name, 0) for object_name in reversed(afc_objects)
+        ]
+        # Stop as soon as the cap is reached; later slots would be dropped anyway
+        while stack and len(slots) < AFC_SLOT_CAP:
+            node, link, depth = stack.pop()
+            # orjson only produces plain dicts/lists, so exact type checks suffice
+            node_type = type(node)
+            if node_type is dict:
                 # Require at least one lane-identifying key to avoid emitting
-                # phantom slots from nested config objects that happen to have a color
-                lane_keys = ("loaded", "tool_loaded", "lane", "slot", "index", "name")
-                has_lane_hint = any(node.get(k) is not None for k in lane_keys)
-                if color and has_lane_hint:
-                    label = self._extract_slot_label(path, node)
+                # phantom slots from nested config objects that happen to have a color.
+                # Both key-presence gates run before any value is normalised, so
+                # only real slot candidates pay for the extractors.
+                color = (
+                    self._extract_hex_color(node)
+                    if not _COLOR_KEY_SET.isdisjoint(node)
+                    and any(node[k] is not None for k in _LANE_KEYS.intersection(node))
+                    else None
+                )
+                if color:
+                    label = self._extract_slot_label(_join_path(link), node)
                     loaded = self._extract_loaded_state(node)
                     tool_loaded = self._extract_tool_loaded_state(node)
                     material_type = self._extract_material_type(node)
@@ -249,37 +682,34 @@ class MoonrakerClient:
                             "manufacturer": manufacturer,
                         })
 
-                for key, value in node.items():
-                    next_path = f"{path}.{key}" if path else str(key)
-                    _walk(next_path, value)
+                if depth < AFC_MAX_DEPTH:
+                    children = [(value, (link, key, False), depth + 1) for key, value in node.items()
+                                if type(value) in _CONTAINER_TYPES]
+                    stack.extend(reversed(children))
 
-            elif isinstance(node, list):
-                for idx, item in enumerate(node):
-                    _walk(f"{path}[{idx}]", item)
+            # Numeric lists (sensor histories, positions) never hold lanes
+            elif (node_type is list and depth < AFC_MAX_DEPTH
+                  and node and not isinstance(node[0], (int, float))):
+                children = [(item, (link, idx, True), depth + 1) for idx, item in enumerate(node)
+                            if type(item) in _CONTAINER_TYPES]
+                stack.extend(reversed(children))
 
-        for object_name in afc_objects:
-            _walk(object_name, status.get(object_name, {}))
-
-        # Safety cap: AFC systems typically have 4-12 lanes max
-        return True, slots[:12]
+        return True, slots
 
+    @_require_client
     async def query_filament_config(self) -> tuple[bool, list[dict[str, Any]]]:
         """Query print_task_config + filament_detect for per-extruder filament info.
 
         Returns (has_config, slots) — has_config is True when the printer
         reports print_task_config with at least one loaded filament.
         NFC spool data from filament_detect enriches slots when available."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
-
         response = await self.client.get(
             "/printer/objects/query",
-            params={"print_task_config": "", "filament_detect": ""},
+            params=_FILAMENT_CONFIG_PARAMS,
         )
-        response.raise_for_status()
-        status = response.json().get("result", {}).get("status", {})
-        config = status.get("print_task_config", {})
-        nfc_info = status.get("filament_detect", {}).get("info", [])
+        status = _json(response).get("result", _EMPTY).get("status", _EMPTY)
+        config = status.get("print_task_config", _EMPTY)
+        nfc_info = status.get("filament_detect", _EMPTY).get("info", [])
 
         if not config:
             return False, []
@@ -329,23 +759,17 @@ class MoonrakerClient:
         if not isinstance(value, str):
             return None
         candidate = value.strip().lstrip("#")
-        if not candidate:
+        # 8-char RGBA drops the alpha channel (last 2 chars); 6-char RGB is
+        # already correct.  Length + charset test instead of a regex match.
+        if len(candidate) not in (6, 8) or not _HEX_DIGITS.issuperset(candidate):
             return None
-        # 8-char RGBA: strip the alpha channel (last 2 chars)
-        if re.fullmatch(r"[0-9a-fA-F]{8}", candidate):
-            return f"#{candidate[:6].upper()}"
-        # 6-char RGB: already correct
-        if re.fullmatch(r"[0-9a-fA-F]{6}", candidate):
-            return f"#{candidate.upper()}"
-        return None
+        return f"#{candidate[:6].upper()}"
 
     @staticmethod
     def _extract_hex_color(node: dict[str, Any]) -> Optional[str]:
-        color_keys = [
-            "color", "colour", "color_hex", "colour_hex", "hex",
-            "spool_color", "filament_color", "loaded_color",
-        ]
-        for key in color_keys:
+        if _COLOR_KEY_SET.isdisjoint(node):
+            return None
+        for key in _COLOR_KEYS:
             value = node.get(key)
             normalized = MoonrakerClient._normalize_hex(value)
             if normalized:
@@ -359,16 +783,16 @@ class MoonrakerClient:
         candidate = value.strip()
         if not candidate:
             return None
-        if not candidate.startswith("#"):
-            candidate = f"#{candidate}"
-        if re.fullmatch(r"#[0-9a-fA-F]{6}", candidate):
-            return candidate.upper()
+        digits = candidate[1:] if candidate.startswith("#") else candidate
+        if len(digits) == 6 and _HEX_DIGITS.issuperset(digits):
+            return f"#{digits.upper()}"
         return None
 
     @staticmethod
     def _extract_loaded_state(node: dict[str, Any]) -> Optional[bool]:
-        bool_keys = ["loaded", "is_loaded", "filament_present", "has_filament", "load", "prep"]
-        for key in bool_keys:
+        if _LOADED_KEY_SET.isdisjoint(node):
+            return None
+        for key in _LOADED_KEYS:
             value = node.get(key)
             if isinstance(value, bool):
                 return value
@@ -376,8 +800,9 @@ class MoonrakerClient:
 
     @staticmethod
     def _extract_tool_loaded_state(node: dict[str, Any]) -> Optional[bool]:
-        bool_keys = ["tool_loaded", "loaded_to_tool", "loaded_to_nozzle", "nozzle_loaded"]
-        for key in bool_keys:
+        if _TOOL_LOADED_KEY_SET.isdisjoint(node):
+            return None
+        for key in _TOOL_LOADED_KEYS:
             value = node.get(key)
             if isinstance(value, bool):
                 return value
@@ -399,11 +824,9 @@ class MoonrakerClient:
 
     @staticmethod
     def _extract_material_type(node: dict[str, Any]) -> Optional[str]:
-        material_keys = [
-            "material", "material_type", "filament_material",
-            "filament_type", "spool_material", "mat",
-        ]
-        for key in material_keys:
+        if _MATERIAL_KEY_SET.isdisjoint(node):
+            return None
+        for key in _MATERIAL_KEYS:
             value = node.get(key)
             normalized = MoonrakerClient._normalize_material_type(value)
             if normalized:
@@ -417,32 +840,23 @@ class MoonrakerClient:
         candidate = value.strip().upper().replace(" ", "")
         if not candidate:
             return None
-        aliases = {
-            "PLA+": "PLA", "PLAPLUS": "PLA", "PET-G": "PETG",
-            "ABS+": "ABS", "NYLON": "PA", "PA6": "PA", "PA12": "PA",
-        }
-        candidate = aliases.get(candidate, candidate)
-        known = {"PLA", "PETG", "ABS", "ASA", "TPU", "PC", "PA", "PVA", "HIPS"}
-        if candidate in known:
+        candidate = _MATERIAL_ALIASES.get(candidate, candidate)
+        if candidate in _KNOWN_MATERIALS:
             return candidate
-        return candidate if len(candidate) <= 12 and re.fullmatch(r"[A-Z0-9_+\-]+", candidate) else None
+        return candidate if len(candidate) <= 12 and _MATERIAL_RE.fullmatch(candidate) else None
 
     @staticmethod
     def _extract_manufacturer(node: dict[str, Any]) -> Optional[str]:
-        manufacturer_keys = [
-            "manufacturer", "brand", "vendor", "vendor_name", "maker",
-            "filament_brand", "material_brand", "spool_brand", "mfr", "supplier",
-        ]
-        for key in manufacturer_keys:
-            value = node.get(key)
-            if isinstance(value, str):
-                cleaned = value.strip()
-                if cleaned:
-                    return cleaned
+        if not _MANUFACTURER_KEY_SET.isdisjoint(node):
+            for key in _MANUFACTURER_KEYS:
+                value = node.get(key)
+                if isinstance(value, str):
+                    cleaned = value.strip()
+                    if cleaned:
+                        return cleaned
 
         for key, value in node.items():
-            key_l = str(key).lower()
-            if any(token in key_l for token in ("manufacturer", "brand", "vendor", "maker", "mfr", "supplier")):
+            if _is_manufacturer_key(key):
                 if isinstance(value, str) and value.strip():
                     return value.strip()
                 if isinstance(value, list) and value and isinstance(value[0], str) and value[0].strip():
@@ -466,21 +880,17 @@ class MoonrakerClient:
         if not text:
             return None
 
-        known = {
-            "bambu": "Bambu", "sunlu": "Sunlu", "esun": "eSUN",
-            "polymaker": "Polymaker", "prusament": "Prusament", "snapmaker": "Snapmaker",
-        }
         lower = text.lower()
-        for token, canonical in known.items():
+        for token, canonical in _KNOWN_MANUFACTURERS:
             if token in lower:
                 return canonical
 
-        first = re.split(r"[\s_\-]+", text)[0].strip("()[]")
+        first = _NAME_SPLIT_RE.split(text)[0].strip("()[]")
         if not first or len(first) < 3:
             return None
-        if re.fullmatch(r"(?i)(pla|petg|abs|asa|tpu|pc|pa|pva)", first):
+        if _PLAIN_MATERIAL_RE.fullmatch(first):
             return None
-        if re.fullmatch(r"[A-Za-z][A-Za-z0-9+._]*", first):
+        if _IDENT_RE.fullmatch(first):
             return first
         return None
 
@@ -516,17 +926,15 @@ class MoonrakerClient:
         parsed_value = urlparse(value)
         if parsed_value.scheme:
             return value
-        return urljoin(self._build_base_url(keep_port=keep_port), value.lstrip("/"))
+        base = self._base_keep_port if keep_port else self._base_no_port
+        return urljoin(base, value.lstrip("/"))
 
+    @_require_client
     async def get_webcams(self) -> list[Dict[str, Any]]:
         """Get configured webcams from Moonraker."""
-        if not self.client:
-            raise RuntimeError("Client not connected. Call connect() first.")
-
         response = await self.client.get("/server/webcams/list")
-        response.raise_for_status()
 
-        webcam_items = response.json().get("result", {}).get("webcams", [])
+        webcam_items = _json(response).get("result", _EMPTY).get("webcams", [])
         webcams = []
         for webcam in webcam_items:
             stream_url = webcam.get("stream_url") or webcam.get("streamUrl") or ""
@@ -5,52 +5,124 @@ in the <build> section, each representing a separate plate with its own
 transform matrix positioning.
 """
 
+import base64
+import functools
+import os
 import zipfile
-import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import logging
 import math
-import re
+
+import numpy as np
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
+# 3MF namespaces
+NS = {
+    "m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02",
+    "p": "http://schemas.microsoft.com/3dmanufacturing/production/2015/06",
+}
+_P_PATH = f"{{{NS['p']}}}path"
+
+# Lookups repeated per object/component are compiled once; libxml2 XPath is
+# considerably cheaper than re-evaluating find()/findall() paths each time.
+_XP_OBJECTS = etree.XPath("m:resources/m:object", namespaces=NS)
+_XP_ITEMS = etree.XPath("m:item", namespaces=NS)
+_XP_COMPONENTS = etree.XPath("m:components/m:component", namespaces=NS)
+_VERTEX_TAG = f"{{{NS['m']}}}vertex"
+_TRIANGLE_TAG = f"{{{NS['m']}}}triangle"
+_XP_VERTEX_COUNT = etree.XPath("count(m:vertex)", namespaces=NS)
+_XP_TRIANGLE_COUNT = etree.XPath("count(m:triangle)", namespaces=NS)
+_XP_SETTINGS_PLATES = etree.XPath("plate")
+_XP_SETTINGS_OBJECTS = etree.XPath("object")
+_XP_PLATER_ID = etree.XPath("metadata[@key='plater_id']/@value", smart_strings=False)
+_XP_PLATER_NAME = etree.XPath("metadata[@key='plater_name']/@value", smart_strings=False)
+_XP_META_NAME = etree.XPath("metadata[@key='name']/@value", smart_strings=False)
+
+_XP_ASSEMBLE_ITEMS = etree.XPath("//assemble_item")
+
+_XML_FEED_CHUNK = 1 << 20
+
+
+def _parse_archive_xml(zf: zipfile.ZipFile, name: str):
+    """Parse an XML part from its zip stream for read-only use.
+
+    Feeding decompressed chunks avoids holding the whole part as bytes next
+    to the tree, and dropping inter-element whitespace saves a text node per
+    vertex/triangle. Trees that get written back out (extract_plate_to_3mf)
+    must not use this.
+    """
+    # Explicit large reads: etree.parse(fh) pulls tiny blocks through
+    # ZipExtFile.read and ends up slower than zf.read + fromstring.
+    parser = etree.XMLParser(remove_blank_text=True, collect_ids=False)
+    with zf.open(name) as fh:
+        for chunk in iter(lambda: fh.read(_XML_FEED_CHUNK), b""):
+            parser.feed(chunk)
+    return parser.close()
+
+
+def _read_bambu_model_settings(
+    zf: zipfile.ZipFile,
+) -> Tuple[Dict[int, str], Dict[str, str], Dict[str, List[float]]]:
+    """Best-effort single-pass parse of Metadata/model_settings.config.
 
-def _read_bambu_assemble_transforms_by_object_id_from_zip(zf: zipfile.ZipFile) -> Dict[str, List[float]]:
-    """Best-effort parse of Metadata/model_settings.config assemble_item transforms keyed by object_id."""
+    Returns (plate names by plater_id, object names by object id,
+    assemble_item transforms by object_id). Objects with more than one
+    assemble_item are left out of the transform map as ambiguous.
+    """
+    plate_names: Dict[int, str] = {}
+    object_names: Dict[str, str] = {}
+    assemble_by_object: Dict[str, List[float]] = {}
     try:
-        if "Metadata/model_settings.config" not in zf.namelist():
-            return {}
-        raw = zf.read("Metadata/model_settings.config").decode("utf-8", errors="ignore")
-    except Exception:
-        return {}
+        ms_root = _parse_archive_xml(zf, "Metadata/model_settings.config")
+    except KeyError:
+        return plate_names, object_names, assemble_by_object
+    except Exception as e:
+        logger.debug(f"Could not parse model_settings.config: {e}")
+        return plate_names, object_names, assemble_by_object
+
+    try:
+        for plate_elem in _XP_SETTINGS_PLATES(ms_root):
+            pid_values = _XP_PLATER_ID(plate_elem)
+            pname_values = _XP_PLATER_NAME(plate_elem)
+            if pid_values and pname_values:
+                pid = int(pid_values[0])
+                pname = pname_values[0].strip()
+                if pid and pname:
+                    plate_names[pid] = pname
+        for obj_elem in _XP_SETTINGS_OBJECTS(ms_root):
+            oid = obj_elem.get("id")
+            name_values = _XP_META_NAME(obj_elem)
+            if oid and name_values:
+                oname = name_values[0].strip()
+                if oname:
+                    object_names[oid] = oname
+    except Exception as e:
+        logger.debug(f"Could not read names from model_settings.config: {e}")
 
-    by_object: Dict[str, List[float]] = {}
     duplicates: set[str] = set()
-    tag_re = re.compile(r"<assemble_item\b(?P<tag>[^>]*)/?>", re.IGNORECASE | re.DOTALL)
-    transform_re = re.compile(r"\btransform=(['\"])(.*?)\1", re.IGNORECASE | re.DOTALL)
-    object_re = re.compile(r"\bobject_id=(['\"])(.*?)\1", re.IGNORECASE | re.DOTALL)
-    for m in tag_re.finditer(raw):
-        tag = m.group("tag") or ""
-        mo = object_re.search(tag)
-        mt = transform_re.search(tag)
-        if not mo or not mt:
+    for item in _XP_ASSEMBLE_ITEMS(ms_root):
+        object_id = item.get("object_id")
+        transform = item.get("transform")
+        if object_id is None or transform is None:
             continue
-        object_id = str(mo.group(2))
-        parts = (mt.group(2) or "").strip().split()
+        parts = transform.split()
         if len(parts) != 12:
             continue
         try:
             vals = [float(v) for v in parts]
         except ValueError:
             continue
-        if object_id in by_object:
+        if object_id in assemble_by_object:
             duplicates.add(object_id)
         else:
-            by_object[object_id] = vals
+            assemble_by_object[object_id] = vals
     for oid in duplicates:
-        by_object.pop(oid, None)
-    return by_object
+        assemble_by_object.pop(oid, None)
+    return plate_names, object_names, assemble_by_object
 
 
 def _parse_3mf_transform_values(transform_str: str, default_identity: bool = True) -> List[float]:
@@ -80,13 +152,42 @@ def _parse_3mf_transform_values(transform_str: str, default_identity: bool = Tru
     return []
 
 
-def _transform_point_3x4(point: List[float], t: List[float]) -> List[float]:
-    x, y, z = point
-    return [
-        t[0] * x + t[1] * y + t[2] * z + t[9],
-        t[3] * x + t[4] * y + t[5] * z + t[10],
-        t[6] * x + t[7] * y + t[8] * z + t[11],
+def _read_vertex_points(vertices_elem) -> np.ndarray:
+    """Return an (N, 3) array for a <vertices> element; missing coordinates read as 0."""
+    raw = [
+        (v.get("x", "0"), v.get("y", "0"), v.get("z", "0"))
+        for v in vertices_elem.iterchildren(_VERTEX_TAG)
     ]
+    return np.array(raw, dtype=np.float64).reshape(-1, 3)
+
+
+def _read_triangle_indices(triangles_elem, vertex_count: int) -> np.ndarray:
+    """Return a (T, 3) int32 array for a <triangles> element, dropping invalid entries."""
+    raw = [
+        (tri.get("v1", "0"), tri.get("v2", "0"), tri.get("v3", "0"))
+        for tri in triangles_elem.iterchildren(_TRIANGLE_TAG)
+    ]
+    try:
+        indices = np.array(raw, dtype=np.int64).reshape(-1, 3)
+    except (ValueError, OverflowError):
+        # Malformed entries are rare; re-parse row by row and skip them.
+        rows: List[List[int]] = []
+        for row in raw:
+            try:
+                values = [int(v) for v in row]
+            except ValueError:
+                continue
+            if all(0 <= v < vertex_count for v in values):
+                rows.append(values)
+        return np.array(rows, dtype=np.int32).reshape(-1, 3)
+    valid = ((indices >= 0) & (indices < vertex_count)).all(axis=1)
+    return indices[valid].astype(np.int32)
+
+
+def _transform_points_3x4(points: np.ndarray, t: List[float]) -> np.ndarray:
+    """Apply a 3x4 affine to an (N, 3) array of points in one matmul."""
+    m = np.asarray(t, dtype=np.float64)
+    return points @ m[:9].reshape(3, 3).T + m[9:12]
 
 
 def _compose_affine_3x4(a: List[float], b: List[float]) -> List[float]:
@@ -108,15 +209,27 @@ def _compose_affine_3x4(a: List[float], b: List[float]) -> List[float]:
 
 
 def _apply_affine_to_bounds_3x4(bmin: List[float], bmax: List[float], t: List[float]) -> Tuple[List[float], List[float]]:
-    """Transform an AABB by a 3x4 affine transform and return enclosing AABB."""
-    corners = []
-    for x in (bmin[0], bmax[0]):
-        for y in (bmin[1], bmax[1]):
-            for z in (bmin[2], bmax[2]):
-                corners.append(_transform_point_3x4([x, y, z], t))
-
-    out_min = [min(p[i] for p in corners) for i in range(3)]
-    out_max = [max(p[i] for p in corners) for i in range(3)]
+    """Transform an AABB by a 3x4 affine transform and return enclosing AABB.
+
+    Takes the per-axis min/max of each matrix term instead of transforming all
+    8 corners; the result is identical because rounding is monotonic.
+    """
+    out_min: List[float] = []
+    out_max: List[float] = []
+    for row in range(3):
+        lo = hi = 0.0
+        for col in range(3):
+            r = t[row * 3 + col]
+            a = r * bmin[col]
+            b = r * bmax[col]
+            if a < b:
+                lo += a
+                hi += b
+            else:
+                lo += b
+                hi += a
+        out_min.append(lo + t[9 + row])
+        out_max.append(hi + t[9 + row])
     return out_min, out_max
 
 
@@ -168,6 +281,113 @@ class PlateInfo:
         }
 
 
+@dataclass
+class _ArchiveInfo:
+    """Plain-data summary of a 3MF archive, memoised across requests.
+
+    Element trees are deliberately not kept: a large single-mesh model parses
+    to gigabytes, so anything that needs geometry re-reads the archive.
+    """
+    resource_names: Dict[str, str]  # object id -> name attribute, or "Object <id>"
+    object_names: Dict[str, str]  # object id -> display name, incl. Bambu sub-model fallback
+    bambu_plate_names: Dict[int, str]
+    bambu_object_names: Dict[str, str]
+    bambu_assemble_by_object: Dict[str, List[float]]
+    build_items: Optional[List[Dict[str, str]]]  # <build>/<item> attributes; None without <build>
+    has_resources: bool
+    # Local bounds per top-level object id; the only mutable field, filled
+    # lazily by _cached_object_bounds
+    object_bounds: Dict[str, Optional[Tuple[List[float], List[float]]]] = field(default_factory=dict)
+
+
+def _read_archive_info(file_path: Path) -> _ArchiveInfo:
+    with zipfile.ZipFile(file_path, "r") as zf:
+        root = _parse_archive_xml(zf, "3D/3dmodel.model")
+
+        resource_names: Dict[str, str] = {}
+        object_names: Dict[str, str] = {}
+        for obj in _XP_OBJECTS(root):
+            obj_id = obj.get("id")
+            if not obj_id:
+                continue
+            resource_names[obj_id] = (obj.get("name") or f"Object {obj_id}").strip() or f"Object {obj_id}"
+            obj_name = (obj.get("name") or "").strip()
+            if obj_name:
+                object_names[obj_id] = obj_name
+                continue
+            # Bambu exports: container objects have no name attr;
+            # resolve from component p:path sub-model references.
+            for comp in _XP_COMPONENTS(obj):
+                p_path = comp.get(_P_PATH)
+                if not p_path:
+                    continue
+                ref_path = p_path.lstrip("/")
+                try:
+                    ref_root = _parse_archive_xml(zf, ref_path)
+                    for ref_obj in _XP_OBJECTS(ref_root):
+                        ref_name = (ref_obj.get("name") or "").strip()
+                        if ref_name:
+                            object_names[obj_id] = ref_name
+                            break
+                except Exception:
+                    pass
+                if obj_id not in object_names:
+                    stem = Path(p_path).stem
+                    if stem:
+                        object_names[obj_id] = stem
+                break  # first component is enough
+
+        build = root.find("m:build", NS)
+        build_items = [dict(item.attrib) for item in _XP_ITEMS(build)] if build is not None else None
+        bambu_plate_names, bambu_object_names, bambu_assemble_by_object = _read_bambu_model_settings(zf)
+
+    return _ArchiveInfo(
+        resource_names=resource_names,
+        object_names=object_names,
+        bambu_plate_names=bambu_plate_names,
+        bambu_object_names=bambu_object_names,
+        bambu_assemble_by_object=bambu_assemble_by_object,
+        build_items=build_items,
+        has_resources=root.find("m:resources", NS) is not None,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _load_archive_info_cached(path: str, mtime_ns: int, size: int) -> _ArchiveInfo:
+    return _read_archive_info(Path(path))
+
+
+def _load_archive_info(file_path: Path) -> _ArchiveInfo:
+    """Return the archive summary, re-reading only when the file's mtime or size changes.
+
+    The result is shared between requests, so callers must treat it as
+    read-only. The one exception is ``object_bounds``, an intentional lazy
+    cache that only ``_cached_object_bounds`` fills. Its entries are
+    derived from the same archive version, so concurrent fills write
+    identical values.
+    """
+    st = os.stat(file_path)
+    return _load_archive_info_cached(str(file_path), st.st_mtime_ns, st.st_size)
+
+
+def _cached_object_bounds(
+    file_path: Path, archive: _ArchiveInfo, object_ids: List[str]
+) -> Dict[str, Optional[Tuple[List[float], List[float]]]]:
+    """Return local bounds for top-level objects, scanning each at most once per archive version."""
+    missing = [
+        oid for oid in dict.fromkeys(object_ids)
+        if oid in archive.resource_names and oid not in archive.object_bounds
+    ]
+    if missing:
+        with zipfile.ZipFile(file_path, "r") as zf:
+            obj_map = _object_elements_by_id(_parse_archive_xml(zf, "3D/3dmodel.model"))
+            sub_models: Dict[str, Any] = {}
+            for oid in missing:
+                if oid in obj_map:
+                    archive.object_bounds[oid] = _scan_object_bounds(zf, obj_map[oid], NS, sub_models)
+    return archive.object_bounds
+
+
 def parse_multi_plate_3mf(file_path: Path) -> Tuple[List[PlateInfo], bool]:
     """
     Parse a 3MF file and detect if it contains multiple plates.
@@ -183,137 +403,70 @@ def parse_multi_plate_3mf(file_path: Path) -> Tuple[List[PlateInfo], bool]:
     plates = []
     
     try:
-        with zipfile.ZipFile(file_path, "r") as zf:
-            # Read the main model file
-            model_xml = zf.read("3D/3dmodel.model")
-            root = ET.fromstring(model_xml)
-            
-            # 3MF namespaces
-            ns = {
-                "m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02",
-                "p": "http://schemas.microsoft.com/3dmanufacturing/production/2015/06"
-            }
-            
-            # --- Bambu metadata: plate names and object names ---
-            # model_settings.config has <plate> elements with plater_name
-            # and <object> elements with name metadata.
-            bambu_plate_names: Dict[int, str] = {}  # plater_id -> plater_name
-            bambu_object_names: Dict[str, str] = {}  # object id -> name
-            try:
-                if "Metadata/model_settings.config" in zf.namelist():
-                    ms_root = ET.fromstring(zf.read("Metadata/model_settings.config"))
-                    for plate_elem in ms_root.findall("plate"):
-                        pid_meta = plate_elem.find("metadata[@key='plater_id']")
-                        pname_meta = plate_elem.find("metadata[@key='plater_name']")
-                        if pid_meta is not None and pname_meta is not None:
-                            pid = int(pid_meta.get("value", "0"))
-                            pname = (pname_meta.get("value") or "").strip()
-                            if pid and pname:
-                                bambu_plate_names[pid] = pname
-                    for obj_elem in ms_root.findall("object"):
-                        oid = obj_elem.get("id")
-                        name_meta = obj_elem.find("metadata[@key='name']")
-                        if oid and name_meta is not None:
-                            oname = (name_meta.get("value") or "").strip()
-                            if oname:
-                                bambu_object_names[oid] = oname
-                    if bambu_plate_names:
-                        logger.info(f"Bambu plate names: {bambu_plate_names}")
-                    if bambu_object_names:
-                        logger.info(f"Bambu object names: {bambu_object_names}")
-            except Exception as e:
-                logger.debug(f"Could not parse model_settings.config: {e}")
-
-            # Build object ID -> name map from 3MF resources (fallback)
-            object_names: Dict[str, str] = {}
-            resources = root.find("m:resources", ns)
-            if resources is not None:
-                p_ns_uri = ns["p"]
-                for obj in resources.findall("m:object", ns):
-                    obj_id = obj.get("id")
-                    obj_name = (obj.get("name") or "").strip()
-                    if obj_id and obj_name:
-                        object_names[obj_id] = obj_name
-                    elif obj_id:
-                        # Bambu exports: container objects have no name attr;
-                        # resolve from component p:path sub-model references.
-                        components = obj.find("m:components", ns)
-                        if components is not None:
-                            for comp in components.findall("m:component", ns):
-                                p_path = comp.get(f"{{{p_ns_uri}}}path")
-                                if not p_path:
-                                    continue
-                                ref_path = p_path.lstrip("/")
-                                try:
-                                    ref_xml = zf.read(ref_path)
-                                    ref_root = ET.fromstring(ref_xml)
-                                    ref_resources = ref_root.find("m:resources", ns)
-                                    if ref_resources is not None:
-                                        for ref_obj in ref_resources.findall("m:object", ns):
-                                            ref_name = (ref_obj.get("name") or "").strip()
-                                            if ref_name:
-                                                object_names[obj_id] = ref_name
-                                                break
-                                except Exception:
-                                    pass
-                                if obj_id not in object_names:
-                                    stem = Path(p_path).stem
-                                    if stem:
-                                        object_names[obj_id] = stem
-                                break  # first component is enough
-
-            # Find build section which contains plate items
-            build = root.find("m:build", ns)
-            if build is None:
-                logger.info("No build section found - single plate file")
-                return [], False
-                
-            # Extract all item elements from build section
-            items = build.findall("m:item", ns)
-            if len(items) <= 1:
-                logger.info(f"Single plate file ({len(items)} item found)")
-                return [], False
-                
-            logger.info(f"Multi-plate file detected: {len(items)} plates")
-            
-            # Parse each item as a plate
-            for i, item in enumerate(items):
-                object_id_attr = item.get("objectid")
-                object_id = object_id_attr if object_id_attr is not None else str(i + 1)
-                printable_str = item.get("printable", "1")
-                printable = printable_str != "0"
-                
-                # Parse transform matrix (default to identity if not present)
-                parsed_3x4 = _parse_3mf_transform_values(item.get("transform", ""))
-                transform_values = _transform_3x4_to_4x4(parsed_3x4)
-                
-                # Name priority: Bambu plate name > Bambu object name > 3MF object name > "Plate N"
-                plate_num = i + 1
-                resolved_name = (
-                    bambu_plate_names.get(plate_num)
-                    or bambu_object_names.get(object_id)
-                    or object_names.get(object_id)
-                    or f"Plate {plate_num}"
-                )
-                plate = PlateInfo(
-                    plate_id=plate_num,
-                    object_id=object_id,
-                    transform=transform_values,
-                    printable=printable,
-                    plate_name=resolved_name
-                )
-                plates.append(plate)
-                
-                tx, ty, tz = plate.get_translation()
-                logger.info(f"Plate {i+1}: Object {object_id} at ({tx:.1f}, {ty:.1f}, {tz:.1f})")
-                
+        archive = _load_archive_info(file_path)
     except zipfile.BadZipFile:
         raise ValueError("Invalid .3mf file: not a valid ZIP archive")
-    except ET.ParseError:
+    except etree.XMLSyntaxError:
         raise ValueError("Invalid .3mf file: malformed XML")
     except KeyError:
         raise ValueError("Invalid .3mf file: missing 3D/3dmodel.model")
-        
+
+    # --- Bambu metadata: plate names and object names ---
+    # model_settings.config has <plate> elements with plater_name
+    # and <object> elements with name metadata.
+    bambu_plate_names = archive.bambu_plate_names
+    bambu_object_names = archive.bambu_object_names
+    if bambu_plate_names:
+        logger.info(f"Bambu plate names: {bambu_plate_names}")
+    if bambu_object_names:
+        logger.info(f"Bambu object names: {bambu_object_names}")
+
+    # Object ID -> name map from 3MF resources (fallback)
+    object_names = archive.object_names
+
+    # Build section items are the plates
+    items = archive.build_items
+    if items is None:
+        logger.info("No build section found - single plate file")
+        return [], False
+
+    if len(items) <= 1:
+        logger.info(f"Single plate file ({len(items)} item found)")
+        return [], False
+
+    logger.info(f"Multi-plate file detected: {len(items)} plates")
+
+    # Parse each item as a plate
+    for i, item in enumerate(items):
+        object_id_attr = item.get("objectid")
+        object_id = object_id_attr if object_id_attr is not None else str(i + 1)
+        printable_str = item.get("printable", "1")
+        printable = printable_str != "0"
+
+        # Parse transform matrix (default to identity if not present)
+        parsed_3x4 = _parse_3mf_transform_values(item.get("transform", ""))
+        transform_values = _transform_3x4_to_4x4(parsed_3x4)
+
+        # Name priority: Bambu plate name > Bambu object name > 3MF object name > "Plate N"
+        plate_num = i + 1
+        resolved_name = (
+            bambu_plate_names.get(plate_num)
+            or bambu_object_names.get(object_id)
+            or object_names.get(object_id)
+            or f"Plate {plate_num}"
+        )
+        plate = PlateInfo(
+            plate_id=plate_num,
+            object_id=object_id,
+            transform=transform_values,
+            printable=printable,
+            plate_name=resolved_name
+        )
+        plates.append(plate)
+
+        tx, ty, tz = plate.get_translation()
+        logger.info(f"Plate {i+1}: Object {object_id} at ({tx:.1f}, {ty:.1f}, {tz:.1f})")
+
     return plates, len(plates) > 1
 
 
@@ -323,179 +476,154 @@ def list_build_items_3mf(file_path: Path, plate_id: Optional[int] = None) -> Lis
     M33 foundation uses top-level build items as transform targets.
     """
     try:
-        with zipfile.ZipFile(file_path, "r") as zf:
-            model_xml = zf.read("3D/3dmodel.model")
-            root = ET.fromstring(model_xml)
-            ns = {
-                "m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02",
-                "p": "http://schemas.microsoft.com/3dmanufacturing/production/2015/06",
-            }
-
-            # Best-effort object names from model resources
-            object_names: Dict[str, str] = {}
-            object_elems: Dict[str, Any] = {}
-            object_bounds_cache: Dict[str, Optional[Tuple[List[float], List[float]]]] = {}
-            resources = root.find("m:resources", ns)
-            if resources is not None:
-                for obj in resources.findall("m:object", ns):
-                    oid = obj.get("id")
-                    if not oid:
-                        continue
-                    object_elems[oid] = obj
-                    object_names[oid] = (obj.get("name") or f"Object {oid}").strip() or f"Object {oid}"
-
-            bambu_assemble_by_object = _read_bambu_assemble_transforms_by_object_id_from_zip(zf)
-
-            build = root.find("m:build", ns)
-            if build is None:
-                return []
-
-            items = build.findall("m:item", ns)
-            if plate_id is not None and (plate_id < 1 or plate_id > len(items)):
-                raise ValueError(f"Plate {plate_id} not found (file has {len(items)} items)")
-
-            target_indices = [plate_id] if plate_id is not None else list(range(1, len(items) + 1))
-            results: List[Dict[str, Any]] = []
-
-            for idx in target_indices:
-                item = items[idx - 1]
-                object_id = item.get("objectid") or str(idx)
-                printable = (item.get("printable", "1") != "0")
-                t3 = _parse_3mf_transform_values(item.get("transform", ""))
-                tx, ty, tz = t3[9], t3[10], t3[11]
-                local_bounds_dict = None
-                world_bounds_dict = None
-                assemble_translation = None
-                assemble_world_bounds_dict = None
-                if object_id in object_elems:
-                    if object_id not in object_bounds_cache:
-                        object_bounds_cache[object_id] = _scan_object_bounds(zf, object_elems[object_id], ns)
-                    cached_bounds = object_bounds_cache.get(object_id)
-                    if cached_bounds is not None:
-                        bmin, bmax = cached_bounds
-                        tbmin, tbmax = _apply_affine_to_bounds_3x4(bmin, bmax, t3)
-                        local_bounds_dict = {
-                            "min": [float(bmin[0]), float(bmin[1]), float(bmin[2])],
-                            "max": [float(bmax[0]), float(bmax[1]), float(bmax[2])],
-                            "size": [
-                                float(bmax[0] - bmin[0]),
-                                float(bmax[1] - bmin[1]),
-                                float(bmax[2] - bmin[2]),
-                            ],
-                        }
-                        world_bounds_dict = {
-                            "min": [float(tbmin[0]), float(tbmin[1]), float(tbmin[2])],
-                            "max": [float(tbmax[0]), float(tbmax[1]), float(tbmax[2])],
-                            "size": [
-                                float(tbmax[0] - tbmin[0]),
-                                float(tbmax[1] - tbmin[1]),
-                                float(tbmax[2] - tbmin[2]),
-                            ],
-                        }
-                        at3 = bambu_assemble_by_object.get(str(object_id))
-                        if at3 is not None:
-                            assemble_translation = [float(at3[9]), float(at3[10]), float(at3[11])]
-                            abmin, abmax = _apply_affine_to_bounds_3x4(bmin, bmax, at3)
-                            assemble_world_bounds_dict = {
-                                "min": [float(abmin[0]), float(abmin[1]), float(abmin[2])],
-                                "max": [float(abmax[0]), float(abmax[1]), float(abmax[2])],
-                                "size": [
-                                    float(abmax[0] - abmin[0]),
-                                    float(abmax[1] - abmin[1]),
-                                    float(abmax[2] - abmin[2]),
-                                ],
-                            }
-                results.append({
-                    "build_item_index": idx,
-                    "plate_id": idx,  # build-item index is the "plate" index in the current parser model
-                    "object_id": object_id,
-                    "name": object_names.get(object_id, f"Object {object_id}"),
-                    "printable": printable,
-                    "transform_3x4": t3,
-                    "transform": _transform_3x4_to_4x4(t3),
-                    "translation": [tx, ty, tz],
-                    "assemble_translation": assemble_translation,
-                    "rotation_z_deg": _estimate_rotation_z_deg_from_3x4(t3),
-                    "local_bounds": local_bounds_dict,
-                    "world_bounds": world_bounds_dict,
-                    "assemble_world_bounds": assemble_world_bounds_dict,
-                })
-
-            return results
+        archive = _load_archive_info(file_path)
+        items = archive.build_items
+        if items is None:
+            return []
+
+        if plate_id is not None and (plate_id < 1 or plate_id > len(items)):
+            raise ValueError(f"Plate {plate_id} not found (file has {len(items)} items)")
+
+        target_indices = [plate_id] if plate_id is not None else list(range(1, len(items) + 1))
+        object_ids = {idx: items[idx - 1].get("objectid") or str(idx) for idx in target_indices}
+
+        object_bounds_cache = _cached_object_bounds(file_path, archive, list(object_ids.values()))
+        bambu_assemble_by_object = archive.bambu_assemble_by_object
+        results: List[Dict[str, Any]] = []
+
+        for idx in target_indices:
+            item = items[idx - 1]
+            object_id = object_ids[idx]
+            printable = (item.get("printable", "1") != "0")
+            t3 = _parse_3mf_transform_values(item.get("transform", ""))
+            tx, ty, tz = t3[9], t3[10], t3[11]
+            local_bounds_dict = None
+            world_bounds_dict = None
+            assemble_translation = None
+            assemble_world_bounds_dict = None
+            cached_bounds = object_bounds_cache.get(object_id)
+            if cached_bounds is not None:
+                bmin, bmax = cached_bounds
+                tbmin, tbmax = _apply_affine_to_bounds_3x4(bmin, bmax, t3)
+                local_bounds_dict = {
+                    "min": [float(bmin[0]), float(bmin[1]), float(bmin[2])],
+                    "max": [float(bmax[0]), float(bmax[1]), float(bmax[2])],
+                    "size": [
+                        float(bmax[0] - bmin[0]),
+                        float(bmax[1] - bmin[1]),
+                        float(bmax[2] - bmin[2]),
+                    ],
+                }
+                world_bounds_dict = {
+                    "min": [float(tbmin[0]), float(tbmin[1]), float(tbmin[2])],
+                    "max": [float(tbmax[0]), float(tbmax[1]), float(tbmax[2])],
+                    "size": [
+                        float(tbmax[0] - tbmin[0]),
+                        float(tbmax[1] - tbmin[1]),
+                        float(tbmax[2] - tbmin[2]),
+                    ],
+                }
+                at3 = bambu_assemble_by_object.get(str(object_id))
+                if at3 is not None:
+                    assemble_translation = [float(at3[9]), float(at3[10]), float(at3[11])]
+                    abmin, abmax = _apply_affine_to_bounds_3x4(bmin, bmax, at3)
+                    assemble_world_bounds_dict = {
+                        "min": [float(abmin[0]), float(abmin[1]), float(abmin[2])],
+                        "max": [float(abmax[0]), float(abmax[1]), float(abmax[2])],
+                        "size": [
+                            float(abmax[0] - abmin[0]),
+                            float(abmax[1] - abmin[1]),
+                            float(abmax[2] - abmin[2]),
+                        ],
+                    }
+            results.append({
+                "build_item_index": idx,
+                "plate_id": idx,  # build-item index is the "plate" index in the current parser model
+                "object_id": object_id,
+                "name": archive.resource_names.get(object_id, f"Object {object_id}"),
+                "printable": printable,
+                "transform_3x4": t3,
+                "transform": _transform_3x4_to_4x4(t3),
+                "translation": [tx, ty, tz],
+                "assemble_translation": assemble_translation,
+                "rotation_z_deg": _estimate_rotation_z_deg_from_3x4(t3),
+                "local_bounds": local_bounds_dict,
+                "world_bounds": world_bounds_dict,
+                "assemble_world_bounds": assemble_world_bounds_dict,
+            })
+
+        return results
     except zipfile.BadZipFile:
         raise ValueError("Invalid .3mf file: not a valid ZIP archive")
-    except ET.ParseError:
+    except etree.XMLSyntaxError:
         raise ValueError("Invalid .3mf file: malformed XML")
     except KeyError:
         raise ValueError("Invalid .3mf file: missing 3D/3dmodel.model")
 
 
+def _object_elements_by_id(root) -> Dict[str, Any]:
+    """Map object id -> <object> element for a parsed model part."""
+    obj_map: Dict[str, Any] = {}
+    for obj in _XP_OBJECTS(root):
+        oid = obj.get("id")
+        if oid:
+            obj_map[oid] = obj
+    return obj_map
+
+
+def _empty_mesh() -> Tuple[np.ndarray, np.ndarray]:
+    return np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.int32)
+
+
 def _collect_object_mesh_geometry(
     zf: zipfile.ZipFile,
-    resources_by_model: Dict[str, Dict[str, Any]],
+    resources_for: Callable[[str], Dict[str, Any]],
     model_path: str,
     object_id: str,
     ns: Dict[str, str],
     transform_3x4: Optional[List[float]] = None,
     depth: int = 0,
     include_modifiers: bool = True,
-) -> Tuple[List[List[float]], List[List[int]]]:
-    """Recursively collect object mesh triangles in local object space."""
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Recursively collect object mesh triangles in local object space.
+
+    Returns ``(vertices, triangles)`` as (V, 3) float64 and (T, 3) int32 arrays.
+    """
     if depth > 12:
         raise ValueError("3MF component nesting too deep")
 
-    obj_map = resources_by_model.get(model_path) or {}
+    obj_map = resources_for(model_path)
     obj_elem = obj_map.get(str(object_id))
     if obj_elem is None:
-        return [], []
+        return _empty_mesh()
 
     obj_type = (obj_elem.get("type") or "model").strip().lower()
     if not include_modifiers and obj_type != "model":
         # Hide modifier/support/other helper meshes from placement viewer by default.
-        return [], []
+        return _empty_mesh()
 
     t = transform_3x4 or _parse_3mf_transform_values("", default_identity=True)
-    vertices_out: List[List[float]] = []
-    triangles_out: List[List[int]] = []
 
     mesh = obj_elem.find("m:mesh", ns)
     if mesh is not None:
         vertices_elem = mesh.find("m:vertices", ns)
         triangles_elem = mesh.find("m:triangles", ns)
-        local_vertices: List[List[float]] = []
-        if vertices_elem is not None:
-            for v in vertices_elem.findall("m:vertex", ns):
-                pt = [float(v.get("x", "0")), float(v.get("y", "0")), float(v.get("z", "0"))]
-                local_vertices.append(_transform_point_3x4(pt, t))
-        if triangles_elem is None or not local_vertices:
-            return local_vertices, []
-
-        base_index = 0
-        vertices_out.extend(local_vertices)
-        for tri in triangles_elem.findall("m:triangle", ns):
-            try:
-                v1 = int(tri.get("v1", "0"))
-                v2 = int(tri.get("v2", "0"))
-                v3 = int(tri.get("v3", "0"))
-            except ValueError:
-                continue
-            if v1 < 0 or v2 < 0 or v3 < 0:
-                continue
-            if v1 >= len(local_vertices) or v2 >= len(local_vertices) or v3 >= len(local_vertices):
-                continue
-            triangles_out.append([base_index + v1, base_index + v2, base_index + v3])
-        return vertices_out, triangles_out
-
-    components = obj_elem.find("m:components", ns)
-    if components is None:
-        return [], []
-
-    p_ns = ns.get("p")
-    for comp in components.findall("m:component", ns):
+        if vertices_elem is None:
+            return _empty_mesh()
+        local_vertices = _transform_points_3x4(_read_vertex_points(vertices_elem), t)
+        if triangles_elem is None or not len(local_vertices):
+            return local_vertices, _empty_mesh()[1]
+        return local_vertices, _read_triangle_indices(triangles_elem, len(local_vertices))
+
+    vertex_parts: List[np.ndarray] = []
+    triangle_parts: List[np.ndarray] = []
+    base_index = 0
+
+    for comp in _XP_COMPONENTS(obj_elem):
         ref_object_id = comp.get("objectid")
         if not ref_object_id:
             continue
-        ref_path_attr = comp.get(f"{{{p_ns}}}path") if p_ns else None
+        ref_path_attr = comp.get(_P_PATH)
         ref_model_path = model_path
         if ref_path_attr:
             ref_model_path = ref_path_attr.lstrip("/")
@@ -504,7 +632,7 @@ def _collect_object_mesh_geometry(
 
         child_vertices, child_triangles = _collect_object_mesh_geometry(
             zf,
-            resources_by_model,
+            resources_for,
             ref_model_path,
             ref_object_id,
             ns,
@@ -512,14 +640,15 @@ def _collect_object_mesh_geometry(
             depth=depth + 1,
             include_modifiers=include_modifiers,
         )
-        if not child_vertices:
+        if not len(child_vertices):
             continue
-        base_index = len(vertices_out)
-        vertices_out.extend(child_vertices)
-        for tri in child_triangles:
-            triangles_out.append([base_index + tri[0], base_index + tri[1], base_index + tri[2]])
+        vertex_parts.append(child_vertices)
+        triangle_parts.append(child_triangles + base_index)
+        base_index += len(child_vertices)
 
-    return vertices_out, triangles_out
+    if not vertex_parts:
+        return _empty_mesh()
+    return np.concatenate(vertex_parts), np.concatenate(triangle_parts).astype(np.int32, copy=False)
 
 
 def list_build_item_geometry_3mf(
@@ -528,74 +657,58 @@ def list_build_item_geometry_3mf(
     build_item_index: Optional[int] = None,
     max_triangles_per_object: int = 20000,
     include_modifiers: bool = True,
+    binary: bool = False,
 ) -> Dict[str, Any]:
-    """Return per-build-item local mesh geometry for the placement viewer."""
+    """Return per-build-item local mesh geometry for the placement viewer.
+
+    With ``binary`` set, ``vertices`` and ``triangles`` are base64-encoded
+    little-endian float32/uint32 buffers (described by ``vertex_dtype`` and
+    ``index_dtype``) instead of nested lists, ready for typed-array views.
+    """
     try:
         def decimate_mesh(
-            vertices_in: List[List[float]],
-            triangles_in: List[List[int]],
+            vertices_in: np.ndarray,
+            triangles_in: np.ndarray,
             max_triangles: int,
-        ) -> Tuple[List[List[float]], List[List[int]], bool]:
+        ) -> Tuple[np.ndarray, np.ndarray, bool]:
             if max_triangles <= 0 or len(triangles_in) <= max_triangles:
                 return vertices_in, triangles_in, False
 
             step = max(1, int(math.ceil(len(triangles_in) / float(max_triangles))))
-            sampled = triangles_in[::step]
-            if len(sampled) > max_triangles:
-                sampled = sampled[:max_triangles]
-
-            used: Dict[int, int] = {}
-            vertices_out: List[List[float]] = []
-            triangles_out: List[List[int]] = []
-            for tri in sampled:
-                remapped: List[int] = []
-                for old_idx in tri:
-                    if old_idx not in used:
-                        used[old_idx] = len(vertices_out)
-                        vertices_out.append(vertices_in[old_idx])
-                    remapped.append(used[old_idx])
-                triangles_out.append(remapped)
-            return vertices_out, triangles_out, True
+            sampled = triangles_in[::step][:max_triangles].reshape(-1)
+
+            # Keep vertices in first-use order (same output as a sequential
+            # remap) and rewrite indices through a lookup table.
+            _, first_use = np.unique(sampled, return_index=True)
+            kept = sampled[np.sort(first_use)]
+            remap = np.empty(len(vertices_in), dtype=np.int32)
+            remap[kept] = np.arange(len(kept), dtype=np.int32)
+            return vertices_in[kept], remap[sampled].reshape(-1, 3), True
 
         with zipfile.ZipFile(file_path, "r") as zf:
-            ns = {
-                "m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02",
-                "p": "http://schemas.microsoft.com/3dmanufacturing/production/2015/06",
+            ns = NS
+            main_model_path = "3D/3dmodel.model"
+            root = _parse_archive_xml(zf, main_model_path)
+            resources_by_model: Dict[str, Dict[str, Any]] = {
+                main_model_path: _object_elements_by_id(root),
             }
 
-            resources_by_model: Dict[str, Dict[str, Any]] = {}
-
             def ensure_resources(model_path: str) -> Dict[str, Any]:
-                if model_path in resources_by_model:
-                    return resources_by_model[model_path]
-                xml_bytes = zf.read(model_path)
-                root = ET.fromstring(xml_bytes)
-                resources = root.find("m:resources", ns)
-                obj_map: Dict[str, Any] = {}
-                if resources is not None:
-                    for obj in resources.findall("m:object", ns):
-                        oid = obj.get("id")
-                        if oid:
-                            obj_map[oid] = obj
-                resources_by_model[model_path] = obj_map
-                return obj_map
-
-            main_model_path = "3D/3dmodel.model"
-            main_xml = zf.read(main_model_path)
-            root = ET.fromstring(main_xml)
-            ensure_resources(main_model_path)
-            for name in zf.namelist():
-                if not name.lower().endswith(".model") or name == main_model_path:
-                    continue
-                try:
-                    ensure_resources(name)
-                except Exception:
-                    continue
+                # Sub-models are parsed only when a component first points at
+                # them; unreadable ones resolve to no objects.
+                if model_path not in resources_by_model:
+                    try:
+                        resources_by_model[model_path] = _object_elements_by_id(
+                            _parse_archive_xml(zf, model_path)
+                        )
+                    except Exception:
+                        resources_by_model[model_path] = {}
+                return resources_by_model[model_path]
 
             build = root.find("m:build", ns)
             if build is None:
                 return {"objects": [], "max_triangles_per_object": max_triangles_per_object}
-            items = build.findall("m:item", ns)
+            items = _XP_ITEMS(build)
             if plate_id is not None and (plate_id < 1 or plate_id > len(items)):
                 raise ValueError(f"Plate {plate_id} not found (file has {len(items)} items)")
             if build_item_index is not None and (build_item_index < 1 or build_item_index > len(items)):
@@ -629,7 +742,7 @@ def list_build_item_geometry_3mf(
                 try:
                     vertices, triangles = _collect_object_mesh_geometry(
                         zf,
-                        resources_by_model,
+                        ensure_resources,
                         main_model_path,
                         object_id,
                         ns,
@@ -637,29 +750,36 @@ def list_build_item_geometry_3mf(
                         include_modifiers=include_modifiers,
                     )
                 except KeyError:
-                    vertices, triangles = [], []
-                except ET.ParseError:
-                    vertices, triangles = [], []
+                    vertices, triangles = _empty_mesh()
+                except etree.XMLSyntaxError:
+                    vertices, triangles = _empty_mesh()
 
                 original_vertex_count = len(vertices)
                 original_triangle_count = len(triangles)
                 vertices, triangles, decimated = decimate_mesh(vertices, triangles, max_triangles_per_object)
                 too_large = original_triangle_count > max_triangles_per_object
 
-                out_objects.append({
+                entry: Dict[str, Any] = {
                     "build_item_index": idx,
                     "object_id": object_id,
-                    "has_mesh": bool(vertices and triangles),
+                    "has_mesh": bool(len(vertices) and len(triangles)),
                     "mesh_too_large": too_large,
                     "mesh_decimated": bool(decimated),
                     "vertex_count": len(vertices),
                     "triangle_count": len(triangles),
                     "original_vertex_count": original_vertex_count,
                     "original_triangle_count": original_triangle_count,
-                    "vertices": vertices,
-                    "triangles": triangles,
                     "include_modifiers": bool(include_modifiers),
-                })
+                }
+                if binary:
+                    entry["vertices"] = base64.b64encode(vertices.astype("<f4").tobytes()).decode("ascii")
+                    entry["triangles"] = base64.b64encode(triangles.astype("<u4").tobytes()).decode("ascii")
+                    entry["vertex_dtype"] = "float32"
+                    entry["index_dtype"] = "uint32"
+                else:
+                    entry["vertices"] = vertices.tolist()
+                    entry["triangles"] = triangles.tolist()
+                out_objects.append(entry)
 
             return {
                 "objects": out_objects,
@@ -667,7 +787,7 @@ def list_build_item_geometry_3mf(
             }
     except zipfile.BadZipFile:
         raise ValueError("Invalid .3mf file: not a valid ZIP archive")
-    except ET.ParseError:
+    except etree.XMLSyntaxError:
         raise ValueError("Invalid .3mf file: malformed XML")
     except KeyError:
         raise ValueError("Invalid .3mf file: missing 3D/3dmodel.model")
@@ -705,13 +825,8 @@ def extract_plate_objects(file_path: Path, target_plate_id: int) -> List[Dict[st
     # Load the specific object for this plate
     try:
         with zipfile.ZipFile(file_path, "r") as zf:
-            model_xml = zf.read("3D/3dmodel.model")
-            root = ET.fromstring(model_xml)
-            
-            ns = {
-                "m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02",
-                "p": "http://schemas.microsoft.com/3dmanufacturing/production/2015/06"
-            }
+            root = _parse_archive_xml(zf, "3D/3dmodel.model")
+            ns = NS
             
             # Find the object in resources
             resources = root.find("m:resources", ns)
@@ -733,47 +848,41 @@ def extract_plate_objects(file_path: Path, target_plate_id: int) -> List[Dict[st
                     if mesh is not None:
                         vertices_elem = mesh.find("m:vertices", ns)
                         if vertices_elem is not None:
-                            vertices_count = len(vertices_elem.findall("m:vertex", ns))
+                            vertices_count = int(_XP_VERTEX_COUNT(vertices_elem))
                         
                         triangles_elem = mesh.find("m:triangles", ns)
                         if triangles_elem is not None:
-                            triangles_count = len(triangles_elem.findall("m:triangle", ns))
+                            triangles_count = int(_XP_TRIANGLE_COUNT(triangles_elem))
                     
                     # Component references (external files)
                     else:
-                        components = obj.find("m:components", ns)
-                        if components is not None:
-                            for component in components.findall("m:component", ns):
-                                p_ns = ns["p"]
-                                ref_path = component.get(f"{{{p_ns}}}path")
-                                ref_object_id = component.get("objectid")
-                                
-                                if ref_path and ref_object_id:
-                                    try:
-                                        ref_path_clean = ref_path.lstrip("/")
-                                        ref_xml = zf.read(ref_path_clean)
-                                        ref_root = ET.fromstring(ref_xml)
-                                        
-                                        ref_resources = ref_root.find("m:resources", ns)
-                                        if ref_resources is not None:
-                                            for ref_obj in ref_resources.findall("m:object", ns):
-                                                if ref_obj.get("id") == ref_object_id:
-                                                    ref_mesh = ref_obj.find("m:mesh", ns)
-                                                    if ref_mesh is not None:
-                                                        vertices_elem = ref_mesh.find("m:vertices", ns)
-                                                        if vertices_elem is not None:
-                                                            vertices_count += len(vertices_elem.findall("m:vertex", ns))
-                                                        
-                                                        triangles_elem = ref_mesh.find("m:triangles", ns)
-                                                        if triangles_elem is not None:
-                                                            triangles_count += len(triangles_elem.findall("m:triangle", ns))
-                                                    
-                                                    ref_name = ref_obj.get("name")
-                                                    if ref_name:
-                                                        name = ref_name
-                                                    break
-                                    except (KeyError, ET.ParseError):
-                                        continue
+                        for component in _XP_COMPONENTS(obj):
+                            ref_path = component.get(_P_PATH)
+                            ref_object_id = component.get("objectid")
+                            
+                            if ref_path and ref_object_id:
+                                try:
+                                    ref_path_clean = ref_path.lstrip("/")
+                                    ref_root = _parse_archive_xml(zf, ref_path_clean)
+                                    
+                                    for ref_obj in _XP_OBJECTS(ref_root):
+                                        if ref_obj.get("id") == ref_object_id:
+                                            ref_mesh = ref_obj.find("m:mesh", ns)
+                                            if ref_mesh is not None:
+                                                vertices_elem = ref_mesh.find("m:vertices", ns)
+                                                if vertices_elem is not None:
+                                                    vertices_count += int(_XP_VERTEX_COUNT(vertices_elem))
+                                                
+                                                triangles_elem = ref_mesh.find("m:triangles", ns)
+                                                if triangles_elem is not None:
+                                                    triangles_count += int(_XP_TRIANGLE_COUNT(triangles_elem))
+                                            
+                                            ref_name = ref_obj.get("name")
+                                            if ref_name:
+                                                name = ref_name
+                                            break
+                                except (KeyError, etree.XMLSyntaxError):
+                                    continue
                     
                     if vertices_count > 0:
                         objects_info.append({
@@ -823,11 +932,22 @@ def _scan_vertex_bounds_from_element(mesh_elem, ns: Dict[str, str]) -> Optional[
     return [min_x, min_y, min_z], [max_x, max_y, max_z]
 
 
-def _scan_object_bounds(zf: zipfile.ZipFile, obj_elem, ns: Dict[str, str]) -> Optional[Tuple[List[float], List[float]]]:
+def _scan_object_bounds(
+    zf: zipfile.ZipFile,
+    obj_elem,
+    ns: Dict[str, str],
+    sub_models: Optional[Dict[str, Any]] = None,
+) -> Optional[Tuple[List[float], List[float]]]:
     """Get bounds for a single object (inline mesh or component references).
 
+    Sticks to the find()/iter() API shared by lxml and ElementTree because
+    copy_duplicator passes in ElementTree elements. Pass a dict as
+    ``sub_models`` to reuse parsed sub-model files across calls.
+
     Returns (min_xyz, max_xyz) or None.
     """
+    if sub_models is None:
+        sub_models = {}
     # Inline mesh
     mesh = obj_elem.find("m:mesh", ns)
     if mesh is not None:
@@ -856,16 +976,17 @@ def _scan_object_bounds(zf: zipfile.ZipFile, obj_elem, ns: Dict[str, str]) -> Op
         if ref_path:
             # External sub-model file
             try:
-                ref_xml = zf.read(ref_path.lstrip("/"))
-                ref_root = ET.fromstring(ref_xml)
-                ref_resources = ref_root.find("m:resources", ns)
+                ref_name = ref_path.lstrip("/")
+                if ref_name not in sub_models:
+                    sub_models[ref_name] = _parse_archive_xml(zf, ref_name)
+                ref_resources = sub_models[ref_name].find("m:resources", ns)
                 if ref_resources is None:
                     continue
                 for ref_obj in ref_resources.findall("m:object", ns):
                     if ref_obj.get("id") == ref_object_id:
                         ref_mesh_elem = ref_obj.find("m:mesh", ns)
                         break
-            except (KeyError, ET.ParseError):
+            except (KeyError, etree.XMLSyntaxError):
                 continue
         else:
             # Local component reference (same model file)
@@ -895,7 +1016,8 @@ def _calculate_xml_bounds(file_path: Path,
                           plate_id: Optional[int] = None) -> Dict[str, Any]:
     """Calculate bounds from XML vertex data without trimesh.
 
-    Opens the ZIP once and scans vertex coordinates directly.
+    Uses the memoised archive summary; object vertex bounds are scanned at
+    most once per archive version.
     """
     if plates is None:
         plates_parsed, is_multi_plate = parse_multi_plate_3mf(file_path)
@@ -903,61 +1025,48 @@ def _calculate_xml_bounds(file_path: Path,
         plates_parsed = plates
         is_multi_plate = len(plates_parsed) > 1
 
-    ns = {
-        "m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02",
-        "p": "http://schemas.microsoft.com/3dmanufacturing/production/2015/06"
-    }
+    archive = _load_archive_info(file_path)
+    if not archive.has_resources:
+        raise ValueError("3MF missing resources section")
 
-    with zipfile.ZipFile(file_path, "r") as zf:
-        model_xml = zf.read("3D/3dmodel.model")
-        root = ET.fromstring(model_xml)
-
-        resources = root.find("m:resources", ns)
-        if resources is None:
-            raise ValueError("3MF missing resources section")
-
-        # Build object_id -> element map
-        obj_map: Dict[str, Any] = {}
-        for obj in resources.findall("m:object", ns):
-            oid = obj.get("id")
-            if oid:
-                obj_map[oid] = obj
-
-        build = root.find("m:build", ns)
-        items = build.findall("m:item", ns) if build is not None else []
-
-        # Determine which items to scan
-        if plate_id is not None:
-            # Single plate
-            if plate_id < 1 or plate_id > len(items):
-                raise ValueError(f"Plate {plate_id} not found (file has {len(items)} items)")
-            target_items = [(plate_id - 1, items[plate_id - 1])]
-        else:
-            # All items
-            target_items = list(enumerate(items))
+    items = archive.build_items or []
+
+    # Determine which items to scan
+    if plate_id is not None:
+        # Single plate
+        if plate_id < 1 or plate_id > len(items):
+            raise ValueError(f"Plate {plate_id} not found (file has {len(items)} items)")
+        target_items = [(plate_id - 1, items[plate_id - 1])]
+    else:
+        # All items
+        target_items = list(enumerate(items))
 
-        global_min = [float('inf')] * 3
-        global_max = [float('-inf')] * 3
-        found = False
+    object_bounds = _cached_object_bounds(
+        file_path, archive, [item.get("objectid") for _, item in target_items if item.get("objectid")]
+    )
 
-        for idx, item in target_items:
-            obj_id = item.get("objectid")
-            if not obj_id or obj_id not in obj_map:
-                continue
+    global_min = [float('inf')] * 3
+    global_max = [float('-inf')] * 3
+    found = False
 
-            bounds = _scan_object_bounds(zf, obj_map[obj_id], ns)
-            if bounds is None:
-                continue
+    for idx, item in target_items:
+        obj_id = item.get("objectid")
+        if not obj_id:
+            continue
+
+        bounds = object_bounds.get(obj_id)
+        if bounds is None:
+            continue
 
-            bmin, bmax = bounds
+        bmin, bmax = bounds
 
-            item_t = _parse_3mf_transform_values(item.get("transform", ""))
-            tbmin, tbmax = _apply_affine_to_bounds_3x4(bmin, bmax, item_t)
+        item_t = _parse_3mf_transform_values(item.get("transform", ""))
+        tbmin, tbmax = _apply_affine_to_bounds_3x4(bmin, bmax, item_t)
 
-            for i in range(3):
-                if tbmin[i] < global_min[i]: global_min[i] = tbmin[i]
-                if tbmax[i] > global_max[i]: global_max[i] = tbmax[i]
-            found = True
+        for i in range(3):
+            if tbmin[i] < global_min[i]: global_min[i] = tbmin[i]
+            if tbmax[i] > global_max[i]: global_max[i] = tbmax[i]
+        found = True
 
     if not found:
         global_min = [0.0, 0.0, 0.0]
@@ -1051,14 +1160,13 @@ def extract_plate_to_3mf(source_3mf: Path, target_plate_id: int, output_3mf: Pat
     try:
         with zipfile.ZipFile(source_3mf, "r") as src_zf:
             model_xml = src_zf.read("3D/3dmodel.model")
-            root = ET.fromstring(model_xml)
+            root = etree.fromstring(model_xml)
 
-            ns = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
-            build = root.find("m:build", ns)
+            build = root.find("m:build", NS)
             if build is None:
                 raise ValueError("3MF missing build section")
 
-            items = build.findall("m:item", ns)
+            items = _XP_ITEMS(build)
             if target_plate_id < 1 or target_plate_id > len(items):
                 raise ValueError(f"Plate {target_plate_id} out of range (1-{len(items)})")
 
@@ -1067,7 +1175,7 @@ def extract_plate_to_3mf(source_3mf: Path, target_plate_id: int, output_3mf: Pat
             for idx, item in enumerate(items, start=1):
                 item.set("printable", "1" if idx == target_plate_id else "0")
 
-            updated_model = ET.tostring(root, encoding="utf-8", xml_declaration=True)
+            updated_model = etree.tostring(root, encoding="utf-8", xml_declaration=True)
 
             with zipfile.ZipFile(output_3mf, "w", zipfile.ZIP_DEFLATED) as dst_zf:
                 for info in src_zf.infolist():
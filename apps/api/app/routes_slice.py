@@ -2854,8 +2854,12 @@ async def get_upload_geometry(
     build_item_index: Optional[int] = Query(None, ge=1),
     include_modifiers: bool = Query(False),
     lod: str = Query("placement_low"),
+    binary: bool = Query(False),
 ):
-    """Return per-build-item local mesh geometry for the placement viewer (M33/M36 shared)."""
+    """Return per-build-item local mesh geometry for the placement viewer (M33/M36 shared).
+
+    ``binary=true`` returns vertices/triangles as base64 float32/uint32 buffers.
+    """
     pool = get_pg_pool()
     async with pool.acquire() as conn:
         upload = await conn.fetchrow(
@@ -2891,6 +2895,7 @@ async def get_upload_geometry(
             build_item_index=build_item_index,
             max_triangles_per_object=max_triangles,
             include_modifiers=include_modifiers,
+            binary=binary,
         )
         return {
             "upload_id": upload_id,
@@ -2899,6 +2904,7 @@ async def get_upload_geometry(
             "selected_plate_id": plate_id,
             "selected_build_item_index": build_item_index,
             "include_modifiers": bool(include_modifiers),
+            "binary": bool(binary),
             "lod": lod_key,
             "max_triangles_per_object": max_triangles,
             "timing_ms": {
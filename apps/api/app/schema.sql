@@ -64,6 +64,11 @@ ALTER TABLE filaments ADD COLUMN IF NOT EXISTS source_type TEXT DEFAULT 'manual'
 ALTER TABLE filaments ADD COLUMN IF NOT EXISTS slicer_settings TEXT;  -- JSON blob of OrcaSlicer-native filament settings
 ALTER TABLE filaments ADD COLUMN IF NOT EXISTS density REAL DEFAULT 1.24;  -- g/cm³ (PLA default)
 
+-- Library sort key (PLA first), stored so listings don't evaluate UPPER(material) per row
+ALTER TABLE filaments ADD COLUMN IF NOT EXISTS sort_rank SMALLINT
+    GENERATED ALWAYS AS (CASE WHEN UPPER(material) = 'PLA' THEN 0 ELSE 1 END) STORED;
+CREATE INDEX IF NOT EXISTS idx_filaments_sort ON filaments(is_default DESC, sort_rank, name);
+
 -- ============================================================================
 -- OLD TABLES (removed - plate-based workflow)
 -- ============================================================================
@@ -141,6 +146,15 @@ ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS skirt_loops INTEGER;
 ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS skirt_distance REAL;
 ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS skirt_height INTEGER;
 ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS setting_modes TEXT;  -- JSON: {"setting_key": "model"|"orca"|"override"}
+ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS enable_flow_calibrate BOOLEAN NOT NULL DEFAULT TRUE;
+
+-- Prime tower columns for databases created before they joined the table definition
+ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS enable_prime_tower BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_volume INTEGER;
+ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_width INTEGER;
+ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_brim_width INTEGER;
+ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_brim_chamfer BOOLEAN NOT NULL DEFAULT TRUE;
+ALTER TABLE slicing_defaults ADD COLUMN IF NOT EXISTS prime_tower_brim_chamfer_max_width INTEGER;
 
 -- Persistent printer connection settings
 CREATE TABLE IF NOT EXISTS printer_settings (
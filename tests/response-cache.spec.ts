@@ -0,0 +1,139 @@
+import { test, expect, APIRequestContext } from '@playwright/test';
+import { API, fixture } from './helpers';
+import fs from 'fs';
+
+// GET /filaments and GET /presets/extruders are served from a short-lived
+// in-process cache with ETags. Every writer must invalidate it, otherwise the
+// UI keeps reading stale settings until the TTL expires.
+
+async function getEtag(request: APIRequestContext, path: string): Promise<string> {
+  const res = await request.get(`${API}${path}`);
+  expect(res.ok()).toBe(true);
+  const etag = res.headers()['etag'];
+  expect(etag).toBeTruthy();
+  return etag;
+}
+
+test.describe('Filament/preset response cache', () => {
+  for (const path of ['/filaments', '/presets/extruders']) {
+    test(`GET ${path} returns an ETag and 304 for a matching If-None-Match`, async ({ request }) => {
+      const etag = await getEtag(request, path);
+
+      const res = await request.get(`${API}${path}`, { headers: { 'If-None-Match': etag } });
+      expect(res.status()).toBe(304);
+      expect(res.headers()['etag']).toBe(etag);
+      expect((await res.body()).length).toBe(0);
+
+      // A stale validator gets the full body again
+      const fresh = await request.get(`${API}${path}`, { headers: { 'If-None-Match': '"stale"' } });
+      expect(fresh.status()).toBe(200);
+      expect(fresh.headers()['etag']).toBe(etag);
+    });
+  }
+
+  test('filament create, update, set-default and delete change the ETag', async ({ request }) => {
+    const listing = await (await request.get(`${API}/filaments`)).json();
+    const originalDefault = listing.filaments.find((f: any) => f.is_default);
+    let filId: number | undefined;
+    try {
+      let etag = await getEtag(request, '/filaments');
+
+      const createRes = await request.post(`${API}/filaments`, {
+        data: {
+          name: `Cache Test ${Date.now()}`,
+          material: 'PLA',
+          nozzle_temp: 200,
+          bed_temp: 60,
+        },
+      });
+      expect(createRes.ok()).toBe(true);
+      filId = (await createRes.json()).id;
+      let next = await getEtag(request, '/filaments');
+      expect(next).not.toBe(etag);
+      etag = next;
+
+      const updateRes = await request.put(`${API}/filaments/${filId}`, {
+        data: {
+          name: `Cache Test Updated ${Date.now()}`,
+          material: 'PETG',
+          nozzle_temp: 230,
+          bed_temp: 70,
+        },
+      });
+      expect(updateRes.ok()).toBe(true);
+      next = await getEtag(request, '/filaments');
+      expect(next).not.toBe(etag);
+      etag = next;
+
+      const defaultRes = await request.post(`${API}/filaments/${filId}/default`);
+      expect(defaultRes.ok()).toBe(true);
+      next = await getEtag(request, '/filaments');
+      expect(next).not.toBe(etag);
+      etag = next;
+
+      if (originalDefault) {
+        await request.post(`${API}/filaments/${originalDefault.id}/default`);
+        etag = await getEtag(request, '/filaments');
+      }
+
+      const delRes = await request.delete(`${API}/filaments/${filId}`);
+      expect(delRes.ok()).toBe(true);
+      filId = undefined;
+      next = await getEtag(request, '/filaments');
+      expect(next).not.toBe(etag);
+    } finally {
+      if (originalDefault) await request.post(`${API}/filaments/${originalDefault.id}/default`);
+      if (filId) await request.delete(`${API}/filaments/${filId}`);
+    }
+  });
+
+  test('filament import changes the ETag', async ({ request }) => {
+    let importedId: number | undefined;
+    try {
+      const etag = await getEtag(request, '/filaments');
+
+      const importRes = await request.post(`${API}/filaments/import`, {
+        multipart: {
+          file: {
+            name: 'test-filament-profile.json',
+            mimeType: 'application/json',
+            buffer: fs.readFileSync(fixture('test-filament-profile.json')),
+          },
+        },
+      });
+      expect(importRes.ok()).toBe(true);
+      importedId = (await importRes.json()).id;
+
+      expect(await getEtag(request, '/filaments')).not.toBe(etag);
+    } finally {
+      if (importedId) await request.delete(`${API}/filaments/${importedId}`);
+    }
+  });
+
+  test('preset update changes the ETag', async ({ request }) => {
+    const presetsRes = await request.get(`${API}/presets/extruders`);
+    const originalPresets = await presetsRes.json();
+    try {
+      const etag = presetsRes.headers()['etag'];
+      expect(etag).toBeTruthy();
+
+      const newWallCount = (originalPresets.slicing_defaults.wall_count || 3) === 3 ? 5 : 3;
+      const putRes = await request.put(`${API}/presets/extruders`, {
+        data: {
+          extruders: originalPresets.extruders,
+          slicing_defaults: { ...originalPresets.slicing_defaults, wall_count: newWallCount },
+        },
+      });
+      expect(putRes.ok()).toBe(true);
+
+      expect(await getEtag(request, '/presets/extruders')).not.toBe(etag);
+    } finally {
+      await request.put(`${API}/presets/extruders`, {
+        data: {
+          extruders: originalPresets.extruders,
+          slicing_defaults: originalPresets.slicing_defaults,
+        },
+      });
+    }
+  });
+});
@@ -239,6 +239,38 @@ test.describe('G-code Viewer', () => {
     expect(Number(obj.triangle_count || 0)).toBeGreaterThan(1000);
   });
 
+  test('placement geometry API binary=true returns float32/uint32 base64 buffers', async ({ request }) => {
+    const upload = await apiUpload(request, 'u1-auxiliary-fan-cover-hex_mw.3mf');
+
+    const [geomRes, binRes] = await Promise.all([
+      request.get(`${API}/uploads/${upload.upload_id}/geometry`, { timeout: 30_000 }),
+      request.get(`${API}/uploads/${upload.upload_id}/geometry?binary=true`, { timeout: 30_000 }),
+    ]);
+    expect(geomRes.ok()).toBe(true);
+    expect(binRes.ok()).toBe(true);
+    const geom = await geomRes.json();
+    const bin = await binRes.json();
+    expect(bin.binary).toBe(true);
+    expect(bin.objects.length).toBe(geom.objects.length);
+
+    const meshObj = bin.objects.find((o: any) => o.has_mesh);
+    expect(meshObj).toBeTruthy();
+    expect(meshObj.vertex_dtype).toBe('float32');
+    expect(meshObj.index_dtype).toBe('uint32');
+
+    const vertexBytes = Buffer.from(meshObj.vertices, 'base64');
+    const indexBytes = Buffer.from(meshObj.triangles, 'base64');
+    expect(vertexBytes.length).toBe(meshObj.vertex_count * 12);
+    expect(indexBytes.length).toBe(meshObj.triangle_count * 12);
+
+    // Same mesh as the JSON list payload
+    const listObj = geom.objects.find((o: any) => o.build_item_index === meshObj.build_item_index);
+    expect(meshObj.vertex_count).toBe(listObj.vertex_count);
+    expect(meshObj.triangle_count).toBe(listObj.triangle_count);
+    expect(vertexBytes.readFloatLE(0)).toBeCloseTo(Number(listObj.vertices[0][0]), 3);
+    expect(indexBytes.readUInt32LE(0)).toBe(Number(listObj.triangles[0][0]));
+  });
+
   test('Shashibo plate 6 placement preview starts on-bed (regression: off-plate selected plate preview)', async ({ page, request }) => {
     await page.setViewportSize({ width: 1440, height: 1400 });
     await waitForApp(page);